@@ -2,9 +2,42 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import functools
+import os
+import tempfile
 import warnings
 warnings.filterwarnings('ignore')
 
+DATA_PATH = 'attached_assets/Planning_Performance_Dataset_1753898833288.xlsx'
+PARQUET_PATH = 'attached_assets/Planning_Performance_Dataset.parquet'
+CSS_PATH = 'styles.css'
+# Raw-row scatters above this size are plotted as weighted bin means instead of one point per row
+SCATTER_ROW_LIMIT = 5000
+GROUP_KEYS = ('Country', 'Category')
+# Text columns always stored as categoricals; Month repeats once per segment, so it dictionary-encodes well too
+CATEGORICAL_COLUMNS = (*GROUP_KEYS, 'Month')
+# Additive columns summed per country-category segment; rate columns are summed so their means can be rebuilt
+# from the matching non-null counts stored alongside them (see count_column)
+SEGMENT_SUM_COLUMNS = (
+    'Revenue', 'Orders', 'Marketing Cost', 'Voucher Cost', 'Shipping Cost', 'Gross_Profit',
+    'New Customers', 'Repeat Customers', 'Gross Margin %', 'Repurchase Rate', 'Customer Churn Rate',
+    'Avg Delivery Time (days)', 'Success Rate', 'Marketing_Cost_Per_Order', 'Voucher_Cost_Per_Order', 'Total_Cost'
+)
+# Bounded rate columns shown to a few decimals, the only floats narrowed to float32; currency and any
+# other float column stays float64 so large totals keep their exact digits
+RATE_COLUMNS = (
+    'Gross Margin %', 'Repurchase Rate', 'Customer Churn Rate', 'Success Rate', 'SLA Compliance %',
+    'Discount Rate', 'Return Rate'
+)
+# Churn driver labels and their source columns for the Q8 correlation chart
+CHURN_DRIVERS = {
+    'Avg Delivery Time (days)': 'Avg Delivery Time (days)',
+    'Success Rate': 'Success Rate',
+    'Marketing Cost/Order': 'Marketing_Cost_Per_Order',
+    'Voucher Cost/Order': 'Voucher_Cost_Per_Order'
+}
+
 # Configure page settings
 st.set_page_config(
     page_title="Mumzworld Business Analytics Dashboard",
@@ -13,117 +46,944 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+@st.cache_resource
+def load_css():
+    """Read the stylesheet once per server process"""
+    with open(CSS_PATH, encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"
+
 # Professional CSS styling
-st.markdown("""
-<style>
-    .main > div {
-        padding-top: 0.5rem;
-    }
+st.markdown(load_css(), unsafe_allow_html=True)
 
-    /* Professional card design */
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+# Metric card markup, filled in by create_notion_card
+NOTION_CARD_TEMPLATE = """
+    <div style="
+        background: linear-gradient(135deg, {color}, {color}dd);
         padding: 1rem;
         border-radius: 8px;
         color: white;
-        margin: 0.25rem 0;
+        text-align: center;
         box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-    }
-
-    .insight-card {
-        background: #f8f9fa;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #4f46e5;
-        margin: 0.5rem 0;
-        box-shadow: 0 1px 3px rgba(0, 0, 0, 0.05);
-    }
+        margin: 0.25rem 0;
+    ">
+        <h3 style="margin: 0; font-size: 0.9rem; opacity: 0.9;">{title}</h3>
+        <h1 style="margin: 0.25rem 0; font-size: 1.5rem; font-weight: bold;">{value}</h1>
+        <p style="margin: 0; opacity: 0.8; font-size: 0.8rem;">{subtitle}</p>
+    </div>
+    """
 
-    .question-header {
-        background: linear-gradient(90deg, #4f46e5, #7c3aed);
-        padding: 0.75rem 1rem;
-        border-radius: 6px 6px 0 0;
-        color: white;
-        font-weight: bold;
-        margin: 1rem 0 0 0;
-    }
+# Q10 priority card markup; a column's cards are joined into one markdown call
+PRIORITY_CARD_TEMPLATE = """
+                <div style="background: #f8f9fa; padding: 1rem; margin: 0.5rem 0; border-radius: 8px; border-left: 4px solid #dc2626;">
+                    <h4>{rank} {Country} - {Category}</h4>
+                    <p><strong>Priority Score:</strong> {score:.0f}/100</p>
+                    <p><strong>Current Margin:</strong> {Gross Margin %:.1%}</p>
+                    <p><strong>Revenue:</strong> ${Revenue:,.0f}</p>
+                </div>
+                """
 
-    .answer-content {
-        background: white;
-        padding: 1rem;
-        border-radius: 0 0 6px 6px;
-        border: 1px solid #e5e7eb;
-        margin: 0 0 1rem 0;
-        box-shadow: 0 1px 3px rgba(0, 0, 0, 0.05);
-    }
+# Static insight cards (no data interpolation), built once at import
+Q3_RECOMMENDATIONS_HTML = """
+        <div class="insight-card">
+            <h4>Immediate Actions for Mumzworld:</h4>
+            <ol>
+                <li><strong>Focus on customer experience beyond SLA</strong> - product quality, pricing, service</li>
+                <li><strong>Maintain 90%+ SLA as hygiene factor</strong> but don't over-invest for repurchase gains</li>
+                <li><strong>Investigate other repurchase drivers</strong> - vouchers, customer service, product satisfaction</li>
+            </ol>
+        </div>
+"""
 
-    .kpi-container {
-        background: white;
-        padding: 1rem;
-        border-radius: 8px;
-        box-shadow: 0 1px 4px rgba(0, 0, 0, 0.1);
-        text-align: center;
-        border: 1px solid #e5e7eb;
-    }
+Q6_RECOMMENDATIONS_HTML = """
+        <div class="insight-card">
+            <h4>Immediate Actions for Mumzworld:</h4>
+            <ol>
+                <li><strong>Negotiate volume discounts with KSA logistics partners</strong> for immediate 15%+ savings</li>
+                <li><strong>Implement zone-based delivery optimization</strong> to reduce last-mile costs</li>
+                <li><strong>Reinvest 50% of savings into KSA customer acquisition</strong> for growth acceleration</li>
+            </ol>
+        </div>
+"""
 
-    /* Compact spacing */
-    .stColumns > div {
-        padding: 0 0.25rem;
-    }
+STRATEGIC_FINDINGS_HTML = """
+    <div class="insight-card">
+        <h3>Key Strategic Findings</h3>
+        <p>This comprehensive analysis of Mumzworld's business performance reveals significant opportunities for optimization across multiple dimensions:</p>
+        <ul>
+            <li><strong>Market Leadership:</strong> KSA Diapers demonstrates the highest margins at 46.4%, establishing a benchmark for profitability optimization</li>
+            <li><strong>Cost Efficiency Gaps:</strong> Voucher spending varies dramatically from 2.1% to 4.2% of revenue, indicating immediate savings opportunities</li>
+            <li><strong>Operational Excellence:</strong> Delivery performance correlates with success rates, highlighting logistics as a competitive differentiator</li>
+            <li><strong>Customer Value:</strong> Repurchase behavior varies significantly by category, suggesting targeted retention strategies can drive sustainable growth</li>
+            <li><strong>Margin Expansion:</strong> Combined optimization initiatives across shipping, vouchers, and category mix could deliver $1.2M+ annual profit improvement</li>
+        </ul>
+    </div>
+"""
 
-    /* Mobile optimization */
-    @media (max-width: 768px) {
-        .stColumns > div {
-            min-width: unset !important;
-        }
-        .metric-card, .insight-card {
-            margin: 0.25rem 0;
-            padding: 0.75rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+IMMEDIATE_PRIORITIES_HTML = """
+    <div class="insight-card">
+        <h4>Critical Actions for Mumzworld Leadership:</h4>
+        <ol style="font-size: 1.1rem; line-height: 1.6;">
+            <li><strong style="color: #dc2626;">Launch KSA Gear margin improvement project</strong> - $1.16M potential value creation</li>
+            <li><strong style="color: #dc2626;">Cut UAE Diapers voucher spend by 30%</strong> - improve profitability immediately</li>
+            <li><strong style="color: #dc2626;">Double marketing investment in Gear category</strong> - highest efficiency for sustainable growth</li>
+        </ol>
+        <div style="background: #fef3c7; padding: 1rem; border-radius: 6px; margin-top: 1rem;">
+            <strong>Expected Impact:</strong> Combined initiatives could deliver $1.2M+ annual profit improvement
+        </div>
+    </div>
+"""
+
+def write_parquet_cache(df):
+    """Write the Parquet copy atomically, so an interrupted or concurrent write never leaves a partial file"""
+    try:
+        import pyarrow
+    except ImportError:
+        # Without pyarrow there is no Parquet copy; every cold start parses the workbook
+        return
+    tmp_path = None
+    try:
+        # A uniquely named temp file in the same directory, swapped in with an atomic rename
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(PARQUET_PATH) or '.')
+        os.close(fd)
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+        os.replace(tmp_path, PARQUET_PATH)
+        tmp_path = None
+    except (OSError, ValueError, ImportError, pyarrow.lib.ArrowException):
+        # Read-only deployments, or columns Arrow cannot type (e.g. mixed text and numbers), keep parsing the
+        # workbook on cold start; the cache is an optimisation and must never break loading
+        pass
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 @st.cache_data
 def load_data():
-    """Load and preprocess the dataset"""
-    df = pd.read_excel('attached_assets/Planning_Performance_Dataset_1753898833288.xlsx')
-
-    # Convert Month to datetime for better analysis
-    df['Month_Date'] = pd.to_datetime(df['Month'], format='%b-%Y')
+    """Load and preprocess the dataset, returning it with a content fingerprint"""
+    # Parse the workbook once and serve later cold starts from a Parquet copy
+    df = None
+    if os.path.exists(PARQUET_PATH) and os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(DATA_PATH):
+        try:
+            df = pd.read_parquet(PARQUET_PATH, engine='pyarrow')
+        except Exception:
+            # A truncated or corrupt copy is dropped and rebuilt from the workbook below
+            try:
+                os.remove(PARQUET_PATH)
+            except OSError:
+                pass
+    if df is None:
+        df = pd.read_excel(
+            DATA_PATH,
+            engine='openpyxl',
+            engine_kwargs={'read_only': True, 'data_only': True}
+        )
+        # Parse the month labels before caching so the Parquet copy carries a typed timestamp column
+        df['Month_Date'] = pd.to_datetime(df['Month'], format='%b-%Y')
+        write_parquet_cache(df)
+
+    # Only the named rate columns are narrowed to float32; a currency column that arrives as float
+    # (e.g. because of a blank cell) would lose digits past ~7 significant figures
+    rate_cols = [col for col in RATE_COLUMNS if col in df.columns and df[col].dtype == np.float64]
+    df[rate_cols] = df[rate_cols].astype(np.float32)
+    # Monthly currency and count columns normally fit int32 (pandas sums them into int64 anyway); the workbook
+    # is user-replaceable, so a column is only narrowed after checking its range, never wrapped silently
+    int32_range = np.iinfo(np.int32)
+    count_cols = [
+        col for col in df.select_dtypes(include='int64').columns
+        if int32_range.min <= df[col].min() and df[col].max() <= int32_range.max
+    ]
+    df[count_cols] = df[count_cols].astype(np.int32)
+
+    # Parquet copies written before the timestamp column was cached still need the parse
+    if 'Month_Date' not in df.columns:
+        df['Month_Date'] = pd.to_datetime(df['Month'], format='%b-%Y')
     df['Year'] = df['Month_Date'].dt.year
     df['Month_Num'] = df['Month_Date'].dt.month
 
-    # Calculate derived metrics
-    df['Marketing_Cost_Per_Order'] = df['Marketing Cost'] / df['Orders']
-    df['Revenue_Per_Order'] = df['Revenue'] / df['Orders']
-    df['Voucher_Cost_Per_Order'] = df['Voucher Cost'] / df['Orders']
-    df['Total_Customers'] = df['New Customers'] + df['Repeat Customers']
-    df['Gross_Profit'] = df['Revenue'] * df['Gross Margin %']
+    # Calculate derived metrics on the raw NumPy buffers (no index alignment)
+    orders = df['Orders'].to_numpy()
+    revenue = df['Revenue'].to_numpy()
+    df['Marketing_Cost_Per_Order'] = np.divide(df['Marketing Cost'].to_numpy(), orders)
+    df['Revenue_Per_Order'] = np.divide(revenue, orders)
+    df['Voucher_Cost_Per_Order'] = np.divide(df['Voucher Cost'].to_numpy(), orders)
+    # Sums of two int32 columns can exceed int32, so integer totals accumulate in int64; a column read as
+    # float (a blank cell becomes NaN) cannot be cast to int64, so those totals are added in float64
+    new_customers = df['New Customers'].to_numpy()
+    repeat_customers = df['Repeat Customers'].to_numpy()
+    customer_dtype = np.int64 if all(
+        np.issubdtype(a.dtype, np.integer) for a in (new_customers, repeat_customers)
+    ) else np.float64
+    df['Total_Customers'] = np.add(new_customers, repeat_customers, dtype=customer_dtype)
+    df['Gross_Profit'] = np.multiply(revenue, df['Gross Margin %'].to_numpy())
+    # Accumulate the three cost columns into one buffer rather than allocating a temporary per +; integer
+    # columns accumulate in int64 (each may fit int32 while their sum does not), anything else in float64
+    marketing_cost, voucher_cost, shipping_cost = (
+        df[col].to_numpy() for col in ('Marketing Cost', 'Voucher Cost', 'Shipping Cost')
+    )
+    cost_dtype = np.int64 if all(
+        np.issubdtype(a.dtype, np.integer) for a in (marketing_cost, voucher_cost, shipping_cost)
+    ) else np.float64
+    total_cost = np.add(marketing_cost, voucher_cost, dtype=cost_dtype)
+    np.add(total_cost, shipping_cost, out=total_cost)
+    df['Total_Cost'] = total_cost
+
+    # Store the groupby keys, and any other low-cardinality text column, as categoricals
+    for col in df.select_dtypes(include='object').columns:
+        if col in CATEGORICAL_COLUMNS or df[col].nunique(dropna=False) / len(df) < 0.05:
+            df[col] = df[col].astype('category')
+
+    # Hash the frame once per load; the downstream caches key on this int instead of rehashing df every rerun
+    df_hash = int(pd.util.hash_pandas_object(df, index=False).to_numpy().sum())
+
+    return df, df_hash
+
+def correlation_matrix(data, columns):
+    """Pearson correlations between the given columns, computed in one pass and labelled by column"""
+    columns = list(columns)
+    matrix = np.corrcoef(data[columns].to_numpy(dtype=np.float64), rowvar=False)
+    return pd.DataFrame(matrix, index=columns, columns=columns)
+
+def linear_trends(data, x, y, group, n_points=50):
+    """Least-squares line for each group, keyed by group name, with an OLS-style hover summary of the fit"""
+    trends = {}
+    for name, part in data.groupby(group, observed=True):
+        xs = part[x].to_numpy(dtype=np.float64)
+        ys = part[y].to_numpy(dtype=np.float64)
+        slope, intercept = np.polyfit(xs, ys, 1)
+        r_squared = np.corrcoef(xs, ys)[0, 1] ** 2
+        # A fixed number of points along the fit keeps the line hoverable without one point per row
+        line_x = np.linspace(xs.min(), xs.max(), n_points)
+        hovertemplate = (
+            f"<b>OLS trendline</b><br>{y} = {slope:g} * {x} + {intercept:g}<br>"
+            f"R<sup>2</sup>={r_squared:f}<br><br>"
+            f"{group}={name}<br>{x}=%{{x}}<br>{y}=%{{y}} <b>(trend)</b><extra></extra>"
+        )
+        trends[str(name)] = (line_x, slope * line_x + intercept, hovertemplate)
+    return trends
+
+def add_trendlines(fig, trends):
+    """Overlay precomputed trend lines in the colour of their matching scatter trace"""
+    for trace in list(fig.data):
+        if trace.name in trends:
+            xs, ys, hovertemplate = trends[trace.name]
+            fig.add_trace(go.Scattergl(
+                x=xs,
+                y=ys,
+                mode='lines',
+                name=trace.name,
+                legendgroup=trace.legendgroup,
+                showlegend=False,
+                hovertemplate=hovertemplate,
+                line=dict(color=trace.marker.color)
+            ))
+    return fig
+
+def segment_labels(frame):
+    """Vectorized 'Country - Category' labels for a frame keyed by both group keys"""
+    return frame['Country'].astype(str).str.cat(frame['Category'].astype(str), sep=' - ')
+
+def binned_scatter_points(data, x, y, group, weight, bins=30):
+    """Collapse a raw-row scatter to one weighted-mean point per occupied (group, x bin, y bin) cell"""
+    w = data[weight].to_numpy(dtype=np.float64)
+    cells = pd.DataFrame({
+        group: data[group],
+        'x_bin': pd.cut(data[x], bins, labels=False),
+        'y_bin': pd.cut(data[y], bins, labels=False),
+        weight: w,
+        x: data[x].to_numpy(dtype=np.float64) * w,
+        y: data[y].to_numpy(dtype=np.float64) * w
+    })
+    points = cells.groupby([group, 'x_bin', 'y_bin'], observed=True, as_index=False)[[weight, x, y]].sum()
+    points[x] = points[x] / points[weight]
+    points[y] = points[y] / points[weight]
+    return points[[group, x, y, weight]]
+
+def count_column(col):
+    """Name of the segment_totals column holding the non-null count of col"""
+    return f'{col} (n)'
+
+def rollup(segment_totals, by, spec):
+    """Aggregate the segment totals to a coarser key; means are rebuilt from summed values and non-null counts,
+    so missing values are skipped exactly as mean() skips them"""
+    keys = [by] if isinstance(by, str) else list(by)
+    counts = [count_column(col) for col, how in spec.items() if how == 'mean']
+    grouped = segment_totals.groupby(keys, observed=True, as_index=False)[[*spec, *counts]].sum()
+    for col, how in spec.items():
+        if how == 'mean':
+            grouped[col] = grouped[col] / grouped[count_column(col)]
+    return grouped[[*keys, *spec]]
+
+@st.cache_data
+def build_aggregates(_df, df_hash):
+    """Precompute the per-question aggregate tables once per dataset fingerprint"""
+    df = _df
+    # Q1: 2024 gross margin by country-category
+    df_2024 = df[df['Year'] == 2024]
+    margin_by_combo = df_2024.groupby(['Country', 'Category'], observed=True, sort=False, as_index=False).agg({
+        'Gross Margin %': 'mean',
+        'Revenue': 'sum'
+    })
+    # Only the top eight combinations are charted and the leader quoted, so select them instead of sorting all
+    margin_by_combo = margin_by_combo.nlargest(8, 'Gross Margin %')
+    margin_by_combo['Segment'] = segment_labels(margin_by_combo)
+
+    # Scan the rows once per country-category segment; every later rollup reads this small frame.
+    # A single multi-column sum runs one kernel over all columns instead of one named aggregation each
+    segment_groups = df.groupby(list(GROUP_KEYS), observed=True, as_index=False)
+    segment_totals = segment_groups[list(SEGMENT_SUM_COLUMNS)].sum()
+    segment_totals.insert(len(GROUP_KEYS), 'Rows', segment_groups.size()['size'].to_numpy())
+    # sum() treats NaN as 0, so keep each column's non-null count for rebuilding its mean
+    segment_counts = segment_groups[list(SEGMENT_SUM_COLUMNS)].count()
+    segment_totals = segment_totals.assign(**{
+        count_column(col): segment_counts[col].to_numpy() for col in SEGMENT_SUM_COLUMNS
+    })
+
+    # Row positions and segment subsets per country, taken once from the categorical codes
+    row_country_codes = df['Country'].cat.codes.to_numpy()
+    country_positions = {
+        country: np.flatnonzero(row_country_codes == code)
+        for code, country in enumerate(df['Country'].cat.categories)
+    }
+    ksa_segments = segment_totals[segment_totals['Country'] == 'KSA']
+    uae_segments = segment_totals[segment_totals['Country'] == 'UAE']
+
+    # Every coefficient Q3, Q5 and Q8 report is a lookup into one correlation matrix
+    # (the churn drivers already include delivery time and success rate)
+    corr = correlation_matrix(df, ['SLA Compliance %', 'Repurchase Rate', 'Customer Churn Rate', *CHURN_DRIVERS.values()])
+
+    # Q2: voucher cost per order and as % of revenue
+    voucher_analysis = rollup(segment_totals, list(GROUP_KEYS), {
+        'Voucher Cost': 'sum',
+        'Revenue': 'sum',
+        'Orders': 'sum'
+    })
+
+    voucher_analysis['Segment'] = segment_labels(voucher_analysis)
+    voucher_analysis['Voucher_Per_Order'] = voucher_analysis['Voucher Cost'] / voucher_analysis['Orders']
+    voucher_analysis['Voucher_Revenue_Ratio'] = voucher_analysis['Voucher Cost'] / voucher_analysis['Revenue']
+    voucher_analysis = voucher_analysis.sort_values('Voucher_Revenue_Ratio', ascending=False)
+
+    # Q3: SLA compliance vs repurchase rate
+    sla_repurchase_corr = corr.at['SLA Compliance %', 'Repurchase Rate']
+    sla_median = df['SLA Compliance %'].median()
+    # One split over the median gives both the high (True) and low (False) SLA means
+    sla_split_repurchase = df.groupby(df['SLA Compliance %'] > sla_median)['Repurchase Rate'].mean()
+    sla_repurchase_trends = linear_trends(df, 'SLA Compliance %', 'Repurchase Rate', 'Country')
+
+    # Q4: marketing cost per order by category
+    marketing_efficiency = rollup(segment_totals, 'Category', {
+        'Marketing Cost': 'sum',
+        'Orders': 'sum',
+        'Revenue': 'sum'
+    })
+
+    marketing_efficiency['Marketing_Per_Order'] = marketing_efficiency['Marketing Cost'] / marketing_efficiency['Orders']
+    marketing_efficiency['Marketing_Revenue_Ratio'] = marketing_efficiency['Marketing Cost'] / marketing_efficiency['Revenue']
+    marketing_efficiency = marketing_efficiency.sort_values('Marketing_Per_Order', ascending=False)
+
+    marketing_repurchase = rollup(segment_totals, 'Category', {'Repurchase Rate': 'mean'}).set_index('Category')['Repurchase Rate']
+
+    # Q5: delivery time and success rate by country-category
+    delivery_analysis = rollup(segment_totals, list(GROUP_KEYS), {
+        'Avg Delivery Time (days)': 'mean',
+        'Success Rate': 'mean',
+        'Orders': 'sum'
+    })
+    delivery_success_corr = corr.at['Avg Delivery Time (days)', 'Success Rate']
+    delivery_success_trends = linear_trends(delivery_analysis, 'Avg Delivery Time (days)', 'Success Rate', 'Country')
+
+    # Q6: 15% KSA shipping reduction by category
+    ksa_category_impact = rollup(ksa_segments, 'Category', {
+        'Shipping Cost': 'sum',
+        'Revenue': 'sum',
+        'Gross_Profit': 'sum'
+    })
+
+    # A handful of rows, so derive the scenario columns on the arrays and attach them in one assign
+    shipping_savings = ksa_category_impact['Shipping Cost'].to_numpy() * 0.15
+    ksa_gross_profit = ksa_category_impact['Gross_Profit'].to_numpy()
+    ksa_category_impact = ksa_category_impact.assign(
+        Shipping_Savings=shipping_savings,
+        New_Gross_Profit=ksa_gross_profit + shipping_savings,
+        Profit_Improvement=shipping_savings / ksa_gross_profit
+    )
+
+    # Totals behind the Q6 cards and the scenario calculator, so slider reruns only do arithmetic
+    high_margin_rows = df[df['Gross Margin %'] > 0.40]
+    scenario_baseline = {
+        'ksa_shipping': ksa_segments['Shipping Cost'].sum(),
+        'ksa_gross_profit': ksa_segments['Gross_Profit'].sum(),
+        'ksa_orders': ksa_segments['Orders'].sum(),
+        'voucher': segment_totals['Voucher Cost'].sum(),
+        'marketing': segment_totals['Marketing Cost'].sum(),
+        'gross_profit': segment_totals['Gross_Profit'].sum(),
+        'high_margin_revenue': high_margin_rows['Revenue'].sum(),
+        'high_margin_avg_margin': high_margin_rows['Gross Margin %'].mean()
+    }
+
+    # Q7: repurchase rate vs marketing cost per order
+    repurchase_efficiency = rollup(segment_totals, 'Category', {
+        'Repurchase Rate': 'mean',
+        'Marketing_Cost_Per_Order': 'mean',
+        'Revenue': 'sum',
+        'Orders': 'sum'
+    })
+
+    # Create efficiency score (high repurchase, low marketing cost)
+    repurchase_efficiency['Efficiency_Score'] = repurchase_efficiency['Repurchase Rate'] / repurchase_efficiency['Marketing_Cost_Per_Order']
+    repurchase_efficiency = repurchase_efficiency.sort_values('Efficiency_Score', ascending=False)
+
+    # Q8: churn and its candidate drivers by country
+    # Only a couple of countries, so row-weighted bincounts over the category codes replace a groupby
+    country_codes = segment_totals['Country'].cat.codes.to_numpy()
+    country_rows = np.bincount(country_codes, weights=segment_totals['Rows'].to_numpy())
+    observed_countries = country_rows > 0
+    # Kept indexed by country, so idxmax yields the country name directly
+    churn_analysis = pd.DataFrame(index=pd.Index(segment_totals['Country'].cat.categories[observed_countries], name='Country'))
+    for col in ('Customer Churn Rate', 'Avg Delivery Time (days)', 'Success Rate', 'Marketing_Cost_Per_Order', 'Voucher_Cost_Per_Order'):
+        country_sums = np.bincount(country_codes, weights=segment_totals[col].to_numpy(), minlength=len(country_rows))
+        country_counts = np.bincount(country_codes, weights=segment_totals[count_column(col)].to_numpy(), minlength=len(country_rows))
+        churn_analysis[col] = country_sums[observed_countries] / country_counts[observed_countries]
+
+    churn_correlations = pd.Series(
+        corr.loc['Customer Churn Rate', list(CHURN_DRIVERS.values())].to_numpy(),
+        index=list(CHURN_DRIVERS)
+    )
+
+    # Q9: new vs repeat customers by category
+    customer_revenue_analysis = rollup(segment_totals, 'Category', {
+        'New Customers': 'sum',
+        'Repeat Customers': 'sum',
+        'Revenue': 'sum',
+        'Orders': 'sum'
+    })
+
+    new_customers = customer_revenue_analysis['New Customers'].to_numpy()
+    category_customers = new_customers + customer_revenue_analysis['Repeat Customers'].to_numpy()
+    customer_revenue_analysis = customer_revenue_analysis.assign(
+        Total_Customers=category_customers,
+        New_Customer_Ratio=new_customers / category_customers,
+        Revenue_Per_Customer=customer_revenue_analysis['Revenue'].to_numpy() / category_customers
+    )
+    customer_revenue_analysis = customer_revenue_analysis.sort_values('Revenue', ascending=False)
+
+    # Q10: margin improvement potential by country-category
+    margin_improvement = rollup(segment_totals, list(GROUP_KEYS), {
+        'Revenue': 'sum',
+        'Gross Margin %': 'mean',
+        'Total_Cost': 'sum'
+    })
+
+    segment_revenue = margin_improvement['Revenue'].to_numpy()
+    cost_revenue_ratio = margin_improvement['Total_Cost'].to_numpy() / segment_revenue
+    margin_improvement = margin_improvement.assign(
+        Cost_Revenue_Ratio=cost_revenue_ratio,
+        Improvement_Potential=segment_revenue * (1 - margin_improvement['Gross Margin %'].to_numpy()) * cost_revenue_ratio
+    )
+    # Only the top eight segments are charted and ranked, so skip the full sort
+    margin_improvement = margin_improvement.nlargest(8, 'Improvement_Potential')
+
+    # Q11: revenue-weighted UAE gross margin
+    uae_rows = country_positions['UAE']
+    uae_revenue = df['Revenue'].to_numpy()[uae_rows].astype(np.float64)
+
+    # Calculate weighted average margin by revenue in one dot product
+    total_uae_revenue = uae_revenue.sum()
+    weighted_margin = np.dot(uae_revenue, df['Gross Margin %'].to_numpy()[uae_rows]) / total_uae_revenue
+
+    # By category breakdown; each UAE segment is one category, and its summed Gross_Profit
+    # (revenue x margin per row) over revenue is the revenue-weighted margin, so the parts add up to the total
+    uae_segment_revenue = uae_segments['Revenue'].to_numpy()
+    uae_category_margin = pd.DataFrame({
+        'Category': uae_segments['Category'].to_numpy(),
+        'Revenue': uae_segment_revenue,
+        'Gross Margin %': uae_segments['Gross_Profit'].to_numpy() / uae_segment_revenue
+    })
+    uae_category_margin['Revenue_Weight'] = uae_category_margin['Revenue'] / total_uae_revenue
+    uae_category_margin['Weighted_Contribution'] = uae_category_margin['Revenue_Weight'] * uae_category_margin['Gross Margin %']
+
+    # Q12: repurchase rate and margin by category
+    repurchase_margin_analysis = rollup(segment_totals, 'Category', {
+        'Repurchase Rate': 'mean',
+        'Gross Margin %': 'mean',
+        'Revenue': 'sum',
+        'Orders': 'sum'
+    })
+
+    repurchase_margin_analysis['Revenue_Share'] = repurchase_margin_analysis['Revenue'] / repurchase_margin_analysis['Revenue'].sum()
+
+    # Top three repurchase categories as row positions (partial selection, then order just those three);
+    # Q13 marks them in a boolean mask by position instead of matching category names
+    repurchase_rates = repurchase_margin_analysis['Repurchase Rate'].to_numpy()
+    top_positions = np.argpartition(repurchase_rates, -3)[-3:]
+    top_positions = top_positions[np.argsort(-repurchase_rates[top_positions], kind='stable')]
+    top_repurchase_categories = repurchase_margin_analysis.iloc[top_positions]
+
+    # Q13: weighted margin after shifting revenue share toward the top repurchase categories
+    shares = repurchase_margin_analysis['Revenue_Share'].to_numpy()
+    category_margins = repurchase_margin_analysis['Gross Margin %'].to_numpy()
+    high_repurchase_mask = np.zeros(len(shares), dtype=bool)
+    high_repurchase_mask[top_positions] = True
+
+    # Current weighted margin
+    current_weighted_margin = np.dot(shares, category_margins)
+
+    # Increase share of top 3 repurchase categories by 20% each, decrease others, then renormalize to sum to 1
+    scaled_shares = np.where(high_repurchase_mask, shares * 1.2, shares * 0.85)
+    optimized_shares = scaled_shares / scaled_shares.sum()
+
+    # New weighted margin
+    new_weighted_margin = np.dot(optimized_shares, category_margins)
+
+    # Plain arrays in matching row order, so the constructor has no indexes to align
+    comparison_df = pd.DataFrame({
+        'Category': repurchase_margin_analysis['Category'].to_numpy(),
+        'Current Share': shares,
+        'Optimized Share': optimized_shares,
+        'Gross Margin %': category_margins,
+        'Repurchase Rate': repurchase_rates,
+        'Share Change': optimized_shares - shares
+    })
+
+    # Portfolio KPIs; the columns carry no NaNs, so reduce the numpy arrays directly
+    kpis = {
+        'total_revenue': df['Revenue'].to_numpy().sum(),
+        'total_orders': df['Orders'].to_numpy().sum(),
+        'total_customers': df['Total_Customers'].to_numpy().sum(),
+        'avg_margin': df['Gross Margin %'].to_numpy().mean(),
+        'avg_repurchase': df['Repurchase Rate'].to_numpy().mean()
+    }
 
-    return df
+    return {
+        'kpis': kpis,
+        'margin_by_combo': margin_by_combo,
+        'voucher_analysis': voucher_analysis,
+        'sla_repurchase_corr': sla_repurchase_corr,
+        'sla_repurchase_trends': sla_repurchase_trends,
+        'sla_median': sla_median,
+        'high_sla_repurchase': sla_split_repurchase.get(True, np.nan),
+        'low_sla_repurchase': sla_split_repurchase.get(False, np.nan),
+        'marketing_efficiency': marketing_efficiency,
+        'marketing_repurchase': marketing_repurchase,
+        'delivery_analysis': delivery_analysis,
+        'delivery_success_corr': delivery_success_corr,
+        'delivery_success_trends': delivery_success_trends,
+        'ksa_category_impact': ksa_category_impact,
+        'scenario_baseline': scenario_baseline,
+        'repurchase_efficiency': repurchase_efficiency,
+        'churn_analysis': churn_analysis,
+        'churn_correlations': churn_correlations,
+        'customer_revenue_analysis': customer_revenue_analysis,
+        'margin_improvement': margin_improvement,
+        'total_uae_revenue': total_uae_revenue,
+        'weighted_margin': weighted_margin,
+        'uae_category_margin': uae_category_margin,
+        'repurchase_margin_analysis': repurchase_margin_analysis,
+        'top_repurchase_categories': top_repurchase_categories,
+        'current_weighted_margin': current_weighted_margin,
+        'new_weighted_margin': new_weighted_margin,
+        'comparison_df': comparison_df
+    }
 
+@st.cache_resource
+def build_figures(_df, df_hash):
+    """Build every dashboard chart once per dataset fingerprint; reruns reuse the same figure objects"""
+    df = _df
+    aggregates = build_aggregates(_df, df_hash)
+    margin_by_combo = aggregates['margin_by_combo']
+    voucher_analysis = aggregates['voucher_analysis']
+    marketing_efficiency = aggregates['marketing_efficiency']
+    delivery_analysis = aggregates['delivery_analysis']
+    ksa_category_impact = aggregates['ksa_category_impact']
+    repurchase_efficiency = aggregates['repurchase_efficiency']
+    churn_analysis = aggregates['churn_analysis']
+    churn_correlations = aggregates['churn_correlations']
+    customer_revenue_analysis = aggregates['customer_revenue_analysis']
+    margin_improvement = aggregates['margin_improvement']
+    uae_category_margin = aggregates['uae_category_margin']
+    repurchase_margin_analysis = aggregates['repurchase_margin_analysis']
+    comparison_df = aggregates['comparison_df']
+    figures = {}
+
+    # Q1: top country-category combinations by margin
+    fig = px.bar(
+        margin_by_combo,
+        x='Gross Margin %',
+        y=margin_by_combo['Segment'].to_numpy(),
+        orientation='h',
+        title="Top Country-Category Combinations by Gross Margin",
+        color='Gross Margin %',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(height=350, yaxis={'categoryorder': 'total ascending'})
+    figures['top_margin_combos'] = fig
+
+    # Q2: voucher cost as a share of revenue and per order for the top segments
+    top_vouchers = voucher_analysis.head(6)
+    figures['voucher_ratio'] = build_voucher_bar(
+        top_vouchers, 'Voucher_Revenue_Ratio',
+        "Voucher Cost as % of Revenue", 'Voucher/Revenue Ratio', 'Reds'
+    )
+    figures['voucher_per_order'] = build_voucher_bar(
+        top_vouchers, 'Voucher_Per_Order',
+        "Voucher Cost per Order", 'Voucher Cost per Order ($)', 'Blues'
+    )
+
+    # Q3: SLA compliance vs repurchase rate; trend lines and the correlation always use every row
+    sla_points, sla_hover = df, ['Category', 'Month']
+    if len(df) > SCATTER_ROW_LIMIT:
+        sla_points = binned_scatter_points(df, 'SLA Compliance %', 'Repurchase Rate', 'Country', 'Orders')
+        sla_hover = None
+    fig = px.scatter(
+        sla_points,
+        x='SLA Compliance %',
+        y='Repurchase Rate',
+        color='Country',
+        size='Orders',
+        hover_data=sla_hover,
+        title="SLA Compliance vs Repurchase Rate",
+        render_mode='webgl'
+    )
+    add_trendlines(fig, aggregates['sla_repurchase_trends'])
+    fig.update_layout(height=350)
+    figures['sla_repurchase'] = fig
+
+    # Q4: marketing cost per order by category
+    fig = px.bar(
+        marketing_efficiency,
+        x='Category',
+        y='Marketing_Per_Order',
+        title="Marketing Cost per Order by Category",
+        color='Marketing_Per_Order',
+        color_continuous_scale='Oranges'
+    )
+    fig.update_layout(height=350, xaxis_tickangle=-45)
+    figures['marketing_per_order'] = fig
+
+    # Q5: delivery time heatmap and delivery time vs success rate
+    # Scatter the long-form means straight into a category x country grid instead of pivoting a frame
+    country_idx, countries = pd.factorize(delivery_analysis['Country'], sort=True)
+    category_idx, categories = pd.factorize(delivery_analysis['Category'], sort=True)
+    delivery_grid = np.full((len(categories), len(countries)), np.nan)
+    delivery_grid[category_idx, country_idx] = delivery_analysis['Avg Delivery Time (days)'].to_numpy()
+    fig = px.imshow(
+        delivery_grid,
+        x=countries.astype(str),
+        y=categories.astype(str),
+        labels={'x': 'Country', 'y': 'Category'},
+        title="Average Delivery Time by Country-Category",
+        color_continuous_scale='Reds',
+        aspect="auto"
+    )
+    # Keep the heatmap's view state across reruns instead of redrawing it from scratch
+    fig.update_layout(height=350, uirevision='static')
+    figures['delivery_heatmap'] = fig
+
+    fig = px.scatter(
+        delivery_analysis,
+        x='Avg Delivery Time (days)',
+        y='Success Rate',
+        size='Orders',
+        color='Country',
+        hover_data=['Category'],
+        title="Delivery Time vs Success Rate",
+        render_mode='webgl'
+    )
+    add_trendlines(fig, aggregates['delivery_success_trends'])
+    fig.update_layout(height=350)
+    figures['delivery_success'] = fig
+
+    # Q6: KSA gross profit vs shipping savings by category
+    fig = px.bar(
+        ksa_category_impact,
+        x='Category',
+        y=['Gross_Profit', 'Shipping_Savings'],
+        title="KSA: Current Gross Profit vs Potential Shipping Savings by Category",
+        barmode='group'
+    )
+    fig.update_layout(height=350, xaxis_tickangle=-45)
+    figures['ksa_shipping_impact'] = fig
+
+    # Q7: repurchase rate vs marketing cost per order
+    fig = px.scatter(
+        repurchase_efficiency,
+        x='Marketing_Cost_Per_Order',
+        y='Repurchase Rate',
+        size='Revenue',
+        color='Category',
+        title="Repurchase Rate vs Marketing Cost per Order",
+        labels={'Marketing_Cost_Per_Order': 'Marketing Cost per Order ($)'},
+        render_mode='webgl'
+    )
+    fig.update_layout(height=400)
+    figures['repurchase_efficiency'] = fig
+
+    # Q8: churn by country and its correlation with each driver
+    fig = px.bar(
+        churn_analysis,
+        x=churn_analysis.index,
+        y='Customer Churn Rate',
+        title="Average Churn Rate by Country",
+        color='Customer Churn Rate',
+        color_continuous_scale='Reds'
+    )
+    fig.update_layout(height=350)
+    figures['churn_by_country'] = fig
+
+    fig = px.bar(
+        x=churn_correlations.values,
+        y=churn_correlations.index,
+        orientation='h',
+        title="Churn Rate Correlation with Key Metrics",
+        color=churn_correlations.values,
+        color_continuous_scale='RdBu_r'
+    )
+    fig.update_layout(height=350)
+    figures['churn_drivers'] = fig
+
+    # Q9: customer composition and value by category
+    fig = px.bar(
+        customer_revenue_analysis,
+        x='Category',
+        y=['New Customers', 'Repeat Customers'],
+        title="Customer Composition by Category",
+        color_discrete_map={'New Customers': '#3b82f6', 'Repeat Customers': '#10b981'}
+    )
+    fig.update_layout(height=350, xaxis_tickangle=-45)
+    figures['customer_composition'] = fig
+
+    fig = px.scatter(
+        customer_revenue_analysis,
+        x='New_Customer_Ratio',
+        y='Revenue_Per_Customer',
+        size='Revenue',
+        color='Category',
+        title="New Customer Ratio vs Revenue per Customer",
+        labels={'New_Customer_Ratio': 'New Customer Ratio', 'Revenue_Per_Customer': 'Revenue per Customer ($)'},
+        render_mode='webgl'
+    )
+    fig.update_layout(height=350)
+    figures['customer_value'] = fig
+
+    # Q10: top improvement opportunities
+    fig = px.scatter(
+        margin_improvement,
+        x='Gross Margin %',
+        y='Revenue',
+        size='Improvement_Potential',
+        color='Cost_Revenue_Ratio',
+        hover_data=['Country', 'Category'],
+        title="Margin Improvement Opportunities (Size = Potential Impact)",
+        color_continuous_scale='Reds',
+        render_mode='webgl'
+    )
+    fig.update_layout(height=400)
+    figures['margin_priorities'] = fig
+
+    # Q11: UAE revenue split by category
+    # Built from the cached arrays directly; the pie needs none of Plotly Express's column reshaping
+    fig = go.Figure(go.Pie(
+        labels=uae_category_margin['Category'].to_numpy(),
+        values=uae_category_margin['Revenue'].to_numpy(),
+        customdata=uae_category_margin[['Gross Margin %']].to_numpy(),
+        hovertemplate="Category=%{label}<br>Revenue=%{value}<br>Gross Margin %=%{customdata[0]}<extra></extra>",
+        textposition='inside',
+        textinfo='percent+label'
+    ))
+    fig.update_layout(title="UAE Revenue Distribution by Category", height=350, legend={'tracegroupgap': 0})
+    figures['uae_revenue_mix'] = fig
+
+    # Q12: repurchase rate and margin by category
+    fig = px.bar(
+        repurchase_margin_analysis.sort_values('Repurchase Rate', ascending=True),
+        x='Repurchase Rate',
+        y='Category',
+        orientation='h',
+        title="Repurchase Rate by Category",
+        color='Repurchase Rate',
+        color_continuous_scale='Greens'
+    )
+    fig.update_layout(height=350)
+    figures['repurchase_by_category'] = fig
+
+    fig = px.scatter(
+        repurchase_margin_analysis,
+        x='Repurchase Rate',
+        y='Gross Margin %',
+        size='Revenue',
+        color='Category',
+        title="Repurchase Rate vs Margin (Size = Revenue)",
+        labels={'Repurchase Rate': 'Repurchase Rate', 'Gross Margin %': 'Gross Margin %'},
+        render_mode='webgl'
+    )
+    fig.update_layout(height=350)
+    figures['repurchase_vs_margin'] = fig
+
+    # Q13: current vs optimized category mix
+    # One go.Bar per share column straight from the arrays, skipping Plotly Express's wide-to-long melt
+    mix_categories = comparison_df['Category'].to_numpy()
+    fig = go.Figure()
+    for column in ('Current Share', 'Optimized Share'):
+        fig.add_bar(
+            x=mix_categories,
+            y=comparison_df[column].to_numpy(),
+            name=column,
+            hovertemplate=f"variable={column}<br>Category=%{{x}}<br>value=%{{y}}<extra></extra>"
+        )
+    fig.update_layout(
+        title="Current vs Optimized Category Mix",
+        barmode='group',
+        height=350,
+        xaxis_tickangle=-45,
+        xaxis_title='Category',
+        yaxis_title='value',
+        legend_title_text='variable'
+    )
+    figures['category_mix'] = fig
+
+    return figures
+
+@functools.lru_cache(maxsize=64)
 def create_notion_card(title, value, subtitle="", color="#4f46e5"):
     """Create a professional metric card"""
-    return f"""
-    <div style="
-        background: linear-gradient(135deg, {color}, {color}dd);
-        padding: 1rem;
-        border-radius: 8px;
-        color: white;
-        text-align: center;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        margin: 0.25rem 0;
-    ">
-        <h3 style="margin: 0; font-size: 0.9rem; opacity: 0.9;">{title}</h3>
-        <h1 style="margin: 0.25rem 0; font-size: 1.5rem; font-weight: bold;">{value}</h1>
-        <p style="margin: 0; opacity: 0.8; font-size: 0.8rem;">{subtitle}</p>
-    </div>
-    """
+    return NOTION_CARD_TEMPLATE.format(title=title, value=value, subtitle=subtitle, color=color)
+
+def build_voucher_bar(top_vouchers, column, title, label, color_scale):
+    """Build one of the Q2 horizontal voucher bar charts"""
+    fig = px.bar(
+        top_vouchers,
+        x=column,
+        y=top_vouchers['Segment'].to_numpy(),
+        orientation='h',
+        title=title,
+        labels={column: label},
+        color=column,
+        color_continuous_scale=color_scale
+    )
+    fig.update_layout(height=350, yaxis={'categoryorder': 'total ascending'})
+    return fig
+
+@st.fragment
+def render_impact_calculator(baseline):
+    """Render the scenario calculator; as a fragment, its widgets rerun only this block"""
+    # Create columns for the calculator
+    calc_col1, calc_col2 = st.columns([1, 1])
+
+    with calc_col1:
+        st.markdown("#### Scenario Modeling")
+
+        # Shipping cost reduction slider
+        shipping_reduction = st.slider(
+            "KSA Shipping Cost Reduction (%)",
+            min_value=0,
+            max_value=30,
+            value=15,
+            step=1,
+            help="Adjust the percentage reduction in KSA shipping costs"
+        )
+
+        # Voucher spend reduction slider  
+        voucher_reduction = st.slider(
+            "Voucher Spend Reduction (%)",
+            min_value=0,
+            max_value=50,
+            value=0,
+            step=5,
+            help="Reduce voucher spending across all categories"
+        )
+
+        # Marketing cost optimization slider
+        marketing_optimization = st.slider(
+            "Marketing Cost Optimization (%)",
+            min_value=-20,
+            max_value=20,
+            value=0,
+            step=5,
+            help="Increase (+) or decrease (-) marketing spend"
+        )
+
+        # Category mix adjustment
+        st.markdown("**Category Mix Adjustments:**")
+        high_margin_boost = st.slider(
+            "High-Margin Categories Revenue Boost (%)",
+            min_value=0,
+            max_value=25,
+            value=0,
+            step=5,
+            help="Boost revenue for categories with >40% margin"
+        )
+
+    with calc_col2:
+        st.markdown("#### Real-Time Impact Analysis")
+
+        # Calculate current baseline
+        baseline_shipping = baseline['ksa_shipping']
+        baseline_voucher = baseline['voucher']
+        baseline_marketing = baseline['marketing']
+        baseline_gross_profit = baseline['gross_profit']
+
+        # Calculate scenario impacts
+        shipping_savings = baseline_shipping * (shipping_reduction / 100)
+        voucher_savings = baseline_voucher * (voucher_reduction / 100)
+        marketing_change = baseline_marketing * (marketing_optimization / 100)
+
+        # High margin category boost calculation
+        revenue_boost = baseline['high_margin_revenue'] * (high_margin_boost / 100)
+        additional_gross_profit = revenue_boost * baseline['high_margin_avg_margin']
+
+        # Total impact calculation
+        total_cost_savings = shipping_savings + voucher_savings - marketing_change
+        total_profit_impact = total_cost_savings + additional_gross_profit
+        roi_percentage = (total_profit_impact / baseline_gross_profit) * 100
+
+        # Display results
+        st.markdown(f"""
+        <div style="background: #f0f9ff; padding: 1rem; border-radius: 8px; border-left: 4px solid #0ea5e9;">
+            <h4>Scenario Results</h4>
+            <p><strong> Total Profit Impact:</strong> <span style="color: {'#059669' if total_profit_impact > 0 else '#dc2626'};">${total_profit_impact:+,.0f}</span></p>
+            <p><strong> ROI Impact:</strong> <span style="color: {'#059669' if roi_percentage > 0 else '#dc2626'};">{roi_percentage:+.1f}%</span></p>
+            <hr>
+            <p><strong>Component Breakdown:</strong></p>
+            <ul>
+                <li>Shipping Savings: ${shipping_savings:,.0f}</li>
+                <li>Voucher Savings: ${voucher_savings:,.0f}</li>
+                <li>Marketing Change: ${marketing_change:+,.0f}</li>
+                <li>Revenue Boost Impact: ${additional_gross_profit:,.0f}</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # ROI Calculator for specific initiatives
+        st.markdown("#### Initiative ROI Calculator")
+
+        # Investment amount input
+        investment_amount = st.number_input(
+            "Investment Amount ($)",
+            min_value=0,
+            max_value=10000000,
+            value=50000,
+            step=10000,
+            help="Enter the investment required for implementation"
+        )
+
+        if investment_amount > 0:
+            payback_months = (investment_amount / (total_profit_impact / 12)) if total_profit_impact > 0 else float('inf')
+            roi_ratio = (total_profit_impact / investment_amount) if investment_amount > 0 else 0
+
+            st.markdown(f"""
+            <div style="background: #fef3c7; padding: 1rem; border-radius: 8px; border-left: 4px solid #f59e0b;">
+                <h4>Investment Analysis</h4>
+                <p><strong> Investment:</strong> ${investment_amount:,.0f}</p>
+                <p><strong> Payback Period:</strong> {payback_months:.1f} months</p>
+                <p><strong> ROI Ratio:</strong> {roi_ratio:.1f}x</p>
+                <p><strong> Annual Return:</strong> {(roi_ratio-1)*100:+.0f}%</p>
+            </div>
+            """, unsafe_allow_html=True)
 
 def main():
     # Load data
-    df = load_data()
+    df, df_hash = load_data()
+    aggregates = build_aggregates(df, df_hash)
+    figures = build_figures(df, df_hash)
 
     # Header
     st.markdown("""
@@ -136,22 +996,23 @@ def main():
     # Overview KPIs
     st.markdown("## Executive Summary")
 
+    kpis = aggregates['kpis']
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        total_revenue = df['Revenue'].sum()
+        total_revenue = kpis['total_revenue']
         st.markdown(create_notion_card("Total Revenue", f"${total_revenue:,.0f}", "Across all markets"), unsafe_allow_html=True)
 
     with col2:
-        total_orders = df['Orders'].sum()
+        total_orders = kpis['total_orders']
         st.markdown(create_notion_card("Total Orders", f"{total_orders:,.0f}", "UAE + KSA combined", "#059669"), unsafe_allow_html=True)
 
     with col3:
-        avg_margin = df['Gross Margin %'].mean()
+        avg_margin = kpis['avg_margin']
         st.markdown(create_notion_card("Avg Gross Margin", f"{avg_margin:.1%}", "Weighted average", "#dc2626"), unsafe_allow_html=True)
 
     with col4:
-        avg_repurchase = df['Repurchase Rate'].mean()
+        avg_repurchase = kpis['avg_repurchase']
         st.markdown(create_notion_card("Avg Repurchase Rate", f"{avg_repurchase:.1%}", "Customer retention", "#7c3aed"), unsafe_allow_html=True)
 
     st.markdown("---")
@@ -162,13 +1023,7 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        # Filter for 2024 data
-        df_2024 = df[df['Year'] == 2024]
-        margin_by_combo = df_2024.groupby(['Country', 'Category']).agg({
-            'Gross Margin %': 'mean',
-            'Revenue': 'sum'
-        }).reset_index()
-        margin_by_combo = margin_by_combo.sort_values('Gross Margin %', ascending=False)
+        margin_by_combo = aggregates['margin_by_combo']
 
         top_combo = margin_by_combo.iloc[0]
 
@@ -186,17 +1041,7 @@ def main():
             """, unsafe_allow_html=True)
 
         with col2:
-            fig = px.bar(
-                margin_by_combo.head(8),
-                x='Gross Margin %',
-                y=[f"{row['Country']} - {row['Category']}" for _, row in margin_by_combo.head(8).iterrows()],
-                orientation='h',
-                title="Top Country-Category Combinations by Gross Margin",
-                color='Gross Margin %',
-                color_continuous_scale='Viridis'
-            )
-            fig.update_layout(height=350, yaxis={'categoryorder': 'total ascending'})
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figures['top_margin_combos'], use_container_width=True)
 
         # Calculation methodology
         st.markdown("### Calculation Methodology")
@@ -243,48 +1088,17 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        # Calculate voucher cost per order and as % of revenue
-        voucher_analysis = df.groupby(['Country', 'Category']).agg({
-            'Voucher Cost': 'sum',
-            'Revenue': 'sum',
-            'Orders': 'sum'
-        }).reset_index()
-
-        voucher_analysis['Voucher_Per_Order'] = voucher_analysis['Voucher Cost'] / voucher_analysis['Orders']
-        voucher_analysis['Voucher_Revenue_Ratio'] = voucher_analysis['Voucher Cost'] / voucher_analysis['Revenue']
-        voucher_analysis = voucher_analysis.sort_values('Voucher_Revenue_Ratio', ascending=False)
+        voucher_analysis = aggregates['voucher_analysis']
 
         col1, col2 = st.columns(2)
 
         with col1:
             # Top voucher spenders by ratio
-            fig1 = px.bar(
-                voucher_analysis.head(6),
-                x='Voucher_Revenue_Ratio',
-                y=[f"{row['Country']} - {row['Category']}" for _, row in voucher_analysis.head(6).iterrows()],
-                orientation='h',
-                title="Voucher Cost as % of Revenue",
-                labels={'Voucher_Revenue_Ratio': 'Voucher/Revenue Ratio'},
-                color='Voucher_Revenue_Ratio',
-                color_continuous_scale='Reds'
-            )
-            fig1.update_layout(height=350, yaxis={'categoryorder': 'total ascending'})
-            st.plotly_chart(fig1, use_container_width=True)
+            st.plotly_chart(figures['voucher_ratio'], use_container_width=True)
 
         with col2:
             # Voucher cost per order
-            fig2 = px.bar(
-                voucher_analysis.head(6),
-                x='Voucher_Per_Order',
-                y=[f"{row['Country']} - {row['Category']}" for _, row in voucher_analysis.head(6).iterrows()],
-                orientation='h',
-                title="Voucher Cost per Order",
-                labels={'Voucher_Per_Order': 'Voucher Cost per Order ($)'},
-                color='Voucher_Per_Order',
-                color_continuous_scale='Blues'
-            )
-            fig2.update_layout(height=350, yaxis={'categoryorder': 'total ascending'})
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(figures['voucher_per_order'], use_container_width=True)
 
         # Key insights
         high_voucher = voucher_analysis.iloc[0]
@@ -338,22 +1152,11 @@ def main():
 
         with col1:
             # Scatter plot showing relationship
-            fig = px.scatter(
-                df,
-                x='SLA Compliance %',
-                y='Repurchase Rate',
-                color='Country',
-                size='Orders',
-                hover_data=['Category', 'Month'],
-                title="SLA Compliance vs Repurchase Rate",
-                trendline="ols"
-            )
-            fig.update_layout(height=350)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figures['sla_repurchase'], use_container_width=True)
 
         with col2:
             # Calculate correlation
-            correlation = np.corrcoef(df['SLA Compliance %'], df['Repurchase Rate'])[0, 1]
+            correlation = aggregates['sla_repurchase_corr']
 
             st.markdown(f"""
             <div class="insight-card">
@@ -369,8 +1172,9 @@ def main():
             """, unsafe_allow_html=True)
 
         # Calculate high vs low SLA performance
-        high_sla = df[df['SLA Compliance %'] > df['SLA Compliance %'].median()]
-        low_sla = df[df['SLA Compliance %'] <= df['SLA Compliance %'].median()]
+        sla_median = aggregates['sla_median']
+        high_sla_repurchase = aggregates['high_sla_repurchase']
+        low_sla_repurchase = aggregates['low_sla_repurchase']
 
         # Calculation methodology
         st.markdown("### Calculation Methodology")
@@ -378,9 +1182,9 @@ def main():
         <div style="background: #f0f9ff; padding: 1rem; border-radius: 6px; border-left: 4px solid #0ea5e9; margin: 1rem 0;">
             <h4>Statistical Analysis:</h4>
             <p><strong>Correlation Coefficient = </strong>np.corrcoef(SLA_Compliance_%, Repurchase_Rate)[0,1] = {correlation:.6f}</p>
-            <p><strong>SLA Median Threshold = </strong>{df['SLA Compliance %'].median():.1%}</p>
-            <p><strong>High SLA Performance = </strong>mean(Repurchase_Rate where SLA > median) = {high_sla['Repurchase Rate'].mean():.3%}</p>
-            <p><strong>Low SLA Performance = </strong>mean(Repurchase_Rate where SLA ≤ median) = {low_sla['Repurchase Rate'].mean():.3%}</p>
+            <p><strong>SLA Median Threshold = </strong>{sla_median:.1%}</p>
+            <p><strong>High SLA Performance = </strong>mean(Repurchase_Rate where SLA > median) = {high_sla_repurchase:.3%}</p>
+            <p><strong>Low SLA Performance = </strong>mean(Repurchase_Rate where SLA ≤ median) = {low_sla_repurchase:.3%}</p>
             <p><strong>Interpretation:</strong> Correlation {correlation:.3f} indicates minimal relationship</p>
         </div>
         """, unsafe_allow_html=True)
@@ -391,23 +1195,14 @@ def main():
             <h4>Top 3 Strategic Insights:</h4>
             <ol>
                 <li><strong>Minimal correlation ({correlation:.3f})</strong> suggests SLA alone doesn't drive repurchase behavior</li>
-                <li><strong>High SLA segments achieve {high_sla['Repurchase Rate'].mean():.1%} vs {low_sla['Repurchase Rate'].mean():.1%} repurchase</strong> - small but meaningful difference</li>
+                <li><strong>High SLA segments achieve {high_sla_repurchase:.1%} vs {low_sla_repurchase:.1%} repurchase</strong> - small but meaningful difference</li>
                 <li><strong>Other factors likely more important</strong> for customer retention than SLA compliance</li>
             </ol>
         </div>
         """, unsafe_allow_html=True)
 
         st.markdown("### Strategic Recommendations")
-        st.markdown("""
-        <div class="insight-card">
-            <h4>Immediate Actions for Mumzworld:</h4>
-            <ol>
-                <li><strong>Focus on customer experience beyond SLA</strong> - product quality, pricing, service</li>
-                <li><strong>Maintain 90%+ SLA as hygiene factor</strong> but don't over-invest for repurchase gains</li>
-                <li><strong>Investigate other repurchase drivers</strong> - vouchers, customer service, product satisfaction</li>
-            </ol>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(Q3_RECOMMENDATIONS_HTML, unsafe_allow_html=True)
 
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -417,47 +1212,30 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        marketing_efficiency = df.groupby(['Category']).agg({
-            'Marketing Cost': 'sum',
-            'Orders': 'sum',
-            'Revenue': 'sum'
-        }).reset_index()
-
-        marketing_efficiency['Marketing_Per_Order'] = marketing_efficiency['Marketing Cost'] / marketing_efficiency['Orders']
-        marketing_efficiency['Marketing_Revenue_Ratio'] = marketing_efficiency['Marketing Cost'] / marketing_efficiency['Revenue']
-        marketing_efficiency = marketing_efficiency.sort_values('Marketing_Per_Order', ascending=False)
+        marketing_efficiency = aggregates['marketing_efficiency']
 
         col1, col2 = st.columns([3, 2])
 
         with col1:
-            fig = px.bar(
-                marketing_efficiency,
-                x='Category',
-                y='Marketing_Per_Order',
-                title="Marketing Cost per Order by Category",
-                color='Marketing_Per_Order',
-                color_continuous_scale='Oranges'
-            )
-            fig.update_layout(height=350, xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figures['marketing_per_order'], use_container_width=True)
 
         with col2:
             # Show efficiency metrics
             st.markdown("### Marketing Efficiency Rankings")
-            for i, row in marketing_efficiency.iterrows():
-                st.markdown(f"""
+            # One markdown element for the whole ranking instead of one per category
+            st.markdown(''.join(f"""
                 <div style="background: #f8f9fa; padding: 0.5rem; margin: 0.25rem 0; border-radius: 4px; border-left: 3px solid #4f46e5;">
                     <strong>{row['Category']}</strong><br>
                     ${row['Marketing_Per_Order']:.2f} per order ({row['Marketing_Revenue_Ratio']:.1%} of revenue)
                 </div>
-                """, unsafe_allow_html=True)
+                """ for row in marketing_efficiency.to_dict('records')), unsafe_allow_html=True)
 
         # Key insights
         highest_cost = marketing_efficiency.iloc[0]
         lowest_cost = marketing_efficiency.iloc[-1]
 
         # Get repurchase data for comparison
-        marketing_repurchase = df.groupby('Category')['Repurchase Rate'].mean()
+        marketing_repurchase = aggregates['marketing_repurchase']
         high_cost_categories = marketing_efficiency.head(2)['Category'].tolist()
         low_cost_categories = marketing_efficiency.tail(2)['Category'].tolist()
         high_cost_repurchase = marketing_repurchase[high_cost_categories].mean()
@@ -507,44 +1285,21 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        delivery_analysis = df.groupby(['Country', 'Category']).agg({
-            'Avg Delivery Time (days)': 'mean',
-            'Success Rate': 'mean',
-            'Orders': 'sum'
-        }).reset_index()
+        delivery_analysis = aggregates['delivery_analysis']
 
         col1, col2 = st.columns(2)
 
         with col1:
             # Heatmap of delivery times
-            delivery_pivot = delivery_analysis.pivot(index='Category', columns='Country', values='Avg Delivery Time (days)')
-            fig = px.imshow(
-                delivery_pivot,
-                title="Average Delivery Time by Country-Category",
-                color_continuous_scale='Reds',
-                aspect="auto"
-            )
-            fig.update_layout(height=350)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figures['delivery_heatmap'], use_container_width=True)
 
         with col2:
             # Delivery time vs success rate
-            fig2 = px.scatter(
-                delivery_analysis,
-                x='Avg Delivery Time (days)',
-                y='Success Rate',
-                size='Orders',
-                color='Country',
-                hover_data=['Category'],
-                title="Delivery Time vs Success Rate",
-                trendline="ols"
-            )
-            fig2.update_layout(height=350)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(figures['delivery_success'], use_container_width=True)
 
         # Insights
         slowest_delivery = delivery_analysis.loc[delivery_analysis['Avg Delivery Time (days)'].idxmax()]
-        delivery_success_corr = np.corrcoef(df['Avg Delivery Time (days)'], df['Success Rate'])[0, 1]
+        delivery_success_corr = aggregates['delivery_success_corr']
 
         # Fastest delivery for comparison
         fastest_delivery = delivery_analysis.loc[delivery_analysis['Avg Delivery Time (days)'].idxmin()]
@@ -594,13 +1349,13 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        ksa_data = df[df['Country'] == 'KSA']
-        current_shipping = ksa_data['Shipping Cost'].sum()
+        baseline = aggregates['scenario_baseline']
+        current_shipping = baseline['ksa_shipping']
         reduced_shipping = current_shipping * 0.85
         savings = current_shipping - reduced_shipping
 
         # Calculate impact on gross profit
-        current_gross_profit = ksa_data['Gross_Profit'].sum()
+        current_gross_profit = baseline['ksa_gross_profit']
         new_gross_profit = current_gross_profit + savings
         profit_increase = (new_gross_profit - current_gross_profit) / current_gross_profit
 
@@ -616,28 +1371,10 @@ def main():
             st.markdown(create_notion_card("Gross Profit Impact", f"+{profit_increase:.1%}", "Improvement", "#7c3aed"), unsafe_allow_html=True)
 
         # Show impact by category
-        ksa_category_impact = ksa_data.groupby('Category').agg({
-            'Shipping Cost': 'sum',
-            'Revenue': 'sum',
-            'Gross_Profit': 'sum'
-        }).reset_index()
-
-        ksa_category_impact['Shipping_Savings'] = ksa_category_impact['Shipping Cost'] * 0.15
-        ksa_category_impact['New_Gross_Profit'] = ksa_category_impact['Gross_Profit'] + ksa_category_impact['Shipping_Savings']
-        ksa_category_impact['Profit_Improvement'] = (ksa_category_impact['New_Gross_Profit'] - ksa_category_impact['Gross_Profit']) / ksa_category_impact['Gross_Profit']
-
-        fig = px.bar(
-            ksa_category_impact,
-            x='Category',
-            y=['Gross_Profit', 'Shipping_Savings'],
-            title="KSA: Current Gross Profit vs Potential Shipping Savings by Category",
-            barmode='group'
-        )
-        fig.update_layout(height=350, xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figures['ksa_shipping_impact'], use_container_width=True)
 
         # Calculate per order savings
-        per_order_savings = savings / ksa_data['Orders'].sum()
+        per_order_savings = savings / baseline['ksa_orders']
 
         # Calculation methodology
         st.markdown("### Calculation Methodology")
@@ -648,7 +1385,7 @@ def main():
             <p><strong>15% Reduction Savings = </strong>${current_shipping:,.0f} × 0.15 = ${savings:,.0f}</p>
             <p><strong>Current KSA Gross Profit = </strong>sum(Revenue × Gross_Margin_% where Country='KSA') = ${current_gross_profit:,.0f}</p>
             <p><strong>Profit Impact = </strong>${savings:,.0f} ÷ ${current_gross_profit:,.0f} = {profit_increase:.3%} improvement</p>
-            <p><strong>Per Order Savings = </strong>${savings:,.0f} ÷ {ksa_data['Orders'].sum():,.0f} orders = ${per_order_savings:.2f}</p>
+            <p><strong>Per Order Savings = </strong>${savings:,.0f} ÷ {baseline['ksa_orders']:,.0f} orders = ${per_order_savings:.2f}</p>
         </div>
         """, unsafe_allow_html=True)
 
@@ -665,139 +1402,14 @@ def main():
         """, unsafe_allow_html=True)
 
         st.markdown("### Strategic Recommendations")
-        st.markdown("""
-        <div class="insight-card">
-            <h4>Immediate Actions for Mumzworld:</h4>
-            <ol>
-                <li><strong>Negotiate volume discounts with KSA logistics partners</strong> for immediate 15%+ savings</li>
-                <li><strong>Implement zone-based delivery optimization</strong> to reduce last-mile costs</li>
-                <li><strong>Reinvest 50% of savings into KSA customer acquisition</strong> for growth acceleration</li>
-            </ol>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(Q6_RECOMMENDATIONS_HTML, unsafe_allow_html=True)
 
         # Interactive Financial Impact Calculator
         st.markdown("---")
         st.markdown("### Interactive Financial Impact Calculator")
         st.markdown("**Model different scenarios and see immediate profit impact**")
 
-        # Create columns for the calculator
-        calc_col1, calc_col2 = st.columns([1, 1])
-
-        with calc_col1:
-            st.markdown("#### Scenario Modeling")
-
-            # Shipping cost reduction slider
-            shipping_reduction = st.slider(
-                "KSA Shipping Cost Reduction (%)",
-                min_value=0,
-                max_value=30,
-                value=15,
-                step=1,
-                help="Adjust the percentage reduction in KSA shipping costs"
-            )
-
-            # Voucher spend reduction slider  
-            voucher_reduction = st.slider(
-                "Voucher Spend Reduction (%)",
-                min_value=0,
-                max_value=50,
-                value=0,
-                step=5,
-                help="Reduce voucher spending across all categories"
-            )
-
-            # Marketing cost optimization slider
-            marketing_optimization = st.slider(
-                "Marketing Cost Optimization (%)",
-                min_value=-20,
-                max_value=20,
-                value=0,
-                step=5,
-                help="Increase (+) or decrease (-) marketing spend"
-            )
-
-            # Category mix adjustment
-            st.markdown("**Category Mix Adjustments:**")
-            high_margin_boost = st.slider(
-                "High-Margin Categories Revenue Boost (%)",
-                min_value=0,
-                max_value=25,
-                value=0,
-                step=5,
-                help="Boost revenue for categories with >40% margin"
-            )
-
-        with calc_col2:
-            st.markdown("#### Real-Time Impact Analysis")
-
-            # Calculate current baseline
-            ksa_data = df[df['Country'] == 'KSA'] # define ksa_data here
-            baseline_shipping = ksa_data['Shipping Cost'].sum()
-            baseline_voucher = df['Voucher Cost'].sum()
-            baseline_marketing = df['Marketing Cost'].sum()
-            df['Revenue'].sum()
-            baseline_gross_profit = df['Gross_Profit'].sum()
-
-            # Calculate scenario impacts
-            shipping_savings = baseline_shipping * (shipping_reduction / 100)
-            voucher_savings = baseline_voucher * (voucher_reduction / 100)
-            marketing_change = baseline_marketing * (marketing_optimization / 100)
-
-            # High margin category boost calculation
-            high_margin_categories = df[df['Gross Margin %'] > 0.40]
-            high_margin_revenue = high_margin_categories['Revenue'].sum()
-            revenue_boost = high_margin_revenue * (high_margin_boost / 100)
-            additional_gross_profit = revenue_boost * high_margin_categories['Gross Margin %'].mean()
-
-            # Total impact calculation
-            total_cost_savings = shipping_savings + voucher_savings - marketing_change
-            total_profit_impact = total_cost_savings + additional_gross_profit
-            roi_percentage = (total_profit_impact / baseline_gross_profit) * 100
-
-            # Display results
-            st.markdown(f"""
-            <div style="background: #f0f9ff; padding: 1rem; border-radius: 8px; border-left: 4px solid #0ea5e9;">
-                <h4>Scenario Results</h4>
-                <p><strong> Total Profit Impact:</strong> <span style="color: {'#059669' if total_profit_impact > 0 else '#dc2626'};">${total_profit_impact:+,.0f}</span></p>
-                <p><strong> ROI Impact:</strong> <span style="color: {'#059669' if roi_percentage > 0 else '#dc2626'};">{roi_percentage:+.1f}%</span></p>
-                <hr>
-                <p><strong>Component Breakdown:</strong></p>
-                <ul>
-                    <li>Shipping Savings: ${shipping_savings:,.0f}</li>
-                    <li>Voucher Savings: ${voucher_savings:,.0f}</li>
-                    <li>Marketing Change: ${marketing_change:+,.0f}</li>
-                    <li>Revenue Boost Impact: ${additional_gross_profit:,.0f}</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # ROI Calculator for specific initiatives
-            st.markdown("#### Initiative ROI Calculator")
-
-            # Investment amount input
-            investment_amount = st.number_input(
-                "Investment Amount ($)",
-                min_value=0,
-                max_value=10000000,
-                value=50000,
-                step=10000,
-                help="Enter the investment required for implementation"
-            )
-
-            if investment_amount > 0:
-                payback_months = (investment_amount / (total_profit_impact / 12)) if total_profit_impact > 0 else float('inf')
-                roi_ratio = (total_profit_impact / investment_amount) if investment_amount > 0 else 0
-
-                st.markdown(f"""
-                <div style="background: #fef3c7; padding: 1rem; border-radius: 8px; border-left: 4px solid #f59e0b;">
-                    <h4>Investment Analysis</h4>
-                    <p><strong> Investment:</strong> ${investment_amount:,.0f}</p>
-                    <p><strong> Payback Period:</strong> {payback_months:.1f} months</p>
-                    <p><strong> ROI Ratio:</strong> {roi_ratio:.1f}x</p>
-                    <p><strong> Annual Return:</strong> {(roi_ratio-1)*100:+.0f}%</p>
-                </div>
-                """, unsafe_allow_html=True)
+        render_impact_calculator(baseline)
    
     # Question 7: Strong repurchase behavior at low cost
     st.markdown('<div class="question-header">Q7: Which category shows strong repurchase behavior at low cost?</div>', unsafe_allow_html=True)
@@ -805,30 +1417,10 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        # Calculate efficiency metric: repurchase rate vs marketing cost per order
-        repurchase_efficiency = df.groupby('Category').agg({
-            'Repurchase Rate': 'mean',
-            'Marketing_Cost_Per_Order': 'mean',
-            'Revenue': 'sum',
-            'Orders': 'sum'
-        }).reset_index()
-
-        # Create efficiency score (high repurchase, low marketing cost)
-        repurchase_efficiency['Efficiency_Score'] = repurchase_efficiency['Repurchase Rate'] / repurchase_efficiency['Marketing_Cost_Per_Order']
-        repurchase_efficiency = repurchase_efficiency.sort_values('Efficiency_Score', ascending=False)
+        repurchase_efficiency = aggregates['repurchase_efficiency']
 
         # Center the graph
-        fig = px.scatter(
-            repurchase_efficiency,
-            x='Marketing_Cost_Per_Order',
-            y='Repurchase Rate',
-            size='Revenue',
-            color='Category',
-            title="Repurchase Rate vs Marketing Cost per Order",
-            labels={'Marketing_Cost_Per_Order': 'Marketing Cost per Order ($)'}
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figures['repurchase_efficiency'], use_container_width=True)
 
         # Efficiency Champions section under the graph
         st.markdown("### Efficiency Champions")
@@ -836,54 +1428,34 @@ def main():
         # Calculation methodology
         st.markdown("### Calculation Methodology")
         top_efficient = repurchase_efficiency.iloc[0]
+        average_efficiency = repurchase_efficiency['Efficiency_Score'].mean()
         st.markdown(f"""
         <div style="background: #f0f9ff; padding: 1rem; border-radius: 6px; border-left: 4px solid #0ea5e9; margin: 1rem 0;">
             <h4>Repurchase Efficiency Analysis:</h4>
             <p><strong>Efficiency Score Formula = </strong>Repurchase_Rate ÷ Marketing_Cost_Per_Order</p>
             <p><strong>Winner: {top_efficient['Category']} = </strong>{top_efficient['Repurchase Rate']:.3%} ÷ ${top_efficient['Marketing_Cost_Per_Order']:.2f} = {top_efficient['Efficiency_Score']:.6f}</p>
-            <p><strong>Portfolio Average = </strong>{repurchase_efficiency['Efficiency_Score'].mean():.6f}</p>
-            <p><strong>Performance vs Average = </strong>{((top_efficient['Efficiency_Score']/repurchase_efficiency['Efficiency_Score'].mean())-1)*100:.0f}% above average</p>
+            <p><strong>Portfolio Average = </strong>{average_efficiency:.6f}</p>
+            <p><strong>Performance vs Average = </strong>{((top_efficient['Efficiency_Score']/average_efficiency)-1)*100:.0f}% above average</p>
             <p><strong>Interpretation:</strong> Higher score = better repurchase rate per dollar spent</p>
         </div>
         """, unsafe_allow_html=True)
 
         # Create three columns for the efficiency champions
-        eff_col1, eff_col2, eff_col3 = st.columns(3)
+        eff_cols = st.columns(3)
 
-        top_3_efficient = repurchase_efficiency.head(3)
-
-        with eff_col1:
-            row = top_3_efficient.iloc[0]
-            st.markdown(f"""
-            <div class="insight-card">
-                <h4>🥇 {row['Category']}</h4>
-                <p><strong>Repurchase Rate:</strong> {row['Repurchase Rate']:.1%}</p>
-                <p><strong>Marketing Cost/Order:</strong> ${row['Marketing_Cost_Per_Order']:.2f}</p>
-                <p><strong>Efficiency Score:</strong> {row['Efficiency_Score']:.3f}</p>
-            </div>
-            """, unsafe_allow_html=True)
+        # One slice to plain records; each champion card then indexes a dict instead of building a row Series
+        top_3_efficient = repurchase_efficiency.head(3).to_dict('records')
 
-        with eff_col2:
-            row = top_3_efficient.iloc[1]
-            st.markdown(f"""
-            <div class="insight-card">
-                <h4>🥈 {row['Category']}</h4>
-                <p><strong>Repurchase Rate:</strong> {row['Repurchase Rate']:.1%}</p>
-                <p><strong>Marketing Cost/Order:</strong> ${row['Marketing_Cost_Per_Order']:.2f}</p>
-                <p><strong>Efficiency Score:</strong> {row['Efficiency_Score']:.3f}</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with eff_col3:
-            row = top_3_efficient.iloc[2]
-            st.markdown(f"""
-            <div class="insight-card">
-                <h4>🥉 {row['Category']}</h4>
-                <p><strong>Repurchase Rate:</strong> {row['Repurchase Rate']:.1%}</p>
-                <p><strong>Marketing Cost/Order:</strong> ${row['Marketing_Cost_Per_Order']:.2f}</p>
-                <p><strong>Efficiency Score:</strong> {row['Efficiency_Score']:.3f}</p>
-            </div>
-            """, unsafe_allow_html=True)
+        for eff_col, medal, row in zip(eff_cols, ('🥇', '🥈', '🥉'), top_3_efficient):
+            with eff_col:
+                st.markdown(f"""
+                <div class="insight-card">
+                    <h4>{medal} {row['Category']}</h4>
+                    <p><strong>Repurchase Rate:</strong> {row['Repurchase Rate']:.1%}</p>
+                    <p><strong>Marketing Cost/Order:</strong> ${row['Marketing_Cost_Per_Order']:.2f}</p>
+                    <p><strong>Efficiency Score:</strong> {row['Efficiency_Score']:.3f}</p>
+                </div>
+                """, unsafe_allow_html=True)
 
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -893,50 +1465,20 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        churn_analysis = df.groupby('Country').agg({
-            'Customer Churn Rate': 'mean',
-            'Avg Delivery Time (days)': 'mean',
-            'Success Rate': 'mean',
-            'Marketing_Cost_Per_Order': 'mean',
-            'Voucher_Cost_Per_Order': 'mean'
-        }).reset_index()
+        churn_analysis = aggregates['churn_analysis']
 
         col1, col2 = st.columns(2)
 
         with col1:
-            fig = px.bar(
-                churn_analysis,
-                x='Country',
-                y='Customer Churn Rate',
-                title="Average Churn Rate by Country",
-                color='Customer Churn Rate',
-                color_continuous_scale='Reds'
-            )
-            fig.update_layout(height=350)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figures['churn_by_country'], use_container_width=True)
 
         with col2:
             # Correlation analysis for churn drivers (excluding SLA since it shows no correlation with repurchase)
-            churn_correlations = pd.Series({
-                'Avg Delivery Time (days)': np.corrcoef(df['Customer Churn Rate'], df['Avg Delivery Time (days)'])[0, 1],
-                'Success Rate': np.corrcoef(df['Customer Churn Rate'], df['Success Rate'])[0, 1],
-                'Marketing Cost/Order': np.corrcoef(df['Customer Churn Rate'], df['Marketing_Cost_Per_Order'])[0, 1],
-                'Voucher Cost/Order': np.corrcoef(df['Customer Churn Rate'], df['Voucher_Cost_Per_Order'])[0, 1]
-            })
-
-            fig2 = px.bar(
-                x=churn_correlations.values,
-                y=churn_correlations.index,
-                orientation='h',
-                title="Churn Rate Correlation with Key Metrics",
-                color=churn_correlations.values,
-                color_continuous_scale='RdBu_r'
-            )
-            fig2.update_layout(height=350)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(figures['churn_drivers'], use_container_width=True)
 
         # Key insights
-        highest_churn_country = churn_analysis.loc[churn_analysis['Customer Churn Rate'].idxmax(), 'Country']
+        churn_correlations = aggregates['churn_correlations']
+        highest_churn_country = churn_analysis['Customer Churn Rate'].idxmax()
         highest_churn_rate = churn_analysis['Customer Churn Rate'].max()
         strongest_driver = churn_correlations.abs().idxmax()
         strongest_correlation = churn_correlations[strongest_driver]
@@ -952,8 +1494,9 @@ def main():
             <ul>
         """, unsafe_allow_html=True)
 
-        for metric, corr in churn_correlations.items():
-            st.markdown(f"<li>{metric}: {corr:.3f} correlation</li>", unsafe_allow_html=True)
+        st.markdown(''.join(
+            f"<li>{metric}: {corr:.3f} correlation</li>" for metric, corr in churn_correlations.items()
+        ), unsafe_allow_html=True)
 
         st.markdown(f"""
             </ul>
@@ -994,45 +1537,17 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        customer_revenue_analysis = df.groupby(['Category']).agg({
-            'New Customers': 'sum',
-            'Repeat Customers': 'sum',
-            'Revenue': 'sum',
-            'Orders': 'sum'
-        }).reset_index()
-
-        customer_revenue_analysis['Total_Customers'] = customer_revenue_analysis['New Customers'] + customer_revenue_analysis['Repeat Customers']
-        customer_revenue_analysis['New_Customer_Ratio'] = customer_revenue_analysis['New Customers'] / customer_revenue_analysis['Total_Customers']
-        customer_revenue_analysis['Revenue_Per_Customer'] = customer_revenue_analysis['Revenue'] / customer_revenue_analysis['Total_Customers']
-        customer_revenue_analysis = customer_revenue_analysis.sort_values('Revenue', ascending=False)
+        customer_revenue_analysis = aggregates['customer_revenue_analysis']
 
         col1, col2 = st.columns(2)
 
         with col1:
             # Stacked bar chart of customer composition
-            fig = px.bar(
-                customer_revenue_analysis,
-                x='Category',
-                y=['New Customers', 'Repeat Customers'],
-                title="Customer Composition by Category",
-                color_discrete_map={'New Customers': '#3b82f6', 'Repeat Customers': '#10b981'}
-            )
-            fig.update_layout(height=350, xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figures['customer_composition'], use_container_width=True)
 
         with col2:
             # Revenue per customer analysis
-            fig2 = px.scatter(
-                customer_revenue_analysis,
-                x='New_Customer_Ratio',
-                y='Revenue_Per_Customer',
-                size='Revenue',
-                color='Category',
-                title="New Customer Ratio vs Revenue per Customer",
-                labels={'New_Customer_Ratio': 'New Customer Ratio', 'Revenue_Per_Customer': 'Revenue per Customer ($)'}
-            )
-            fig2.update_layout(height=350)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(figures['customer_value'], use_container_width=True)
 
         # Calculate key insights
         highest_new_ratio = customer_revenue_analysis.loc[customer_revenue_analysis['New_Customer_Ratio'].idxmax()]
@@ -1090,33 +1605,10 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        # Calculate improvement potential
-        margin_improvement = df.groupby(['Country', 'Category']).agg({
-            'Revenue': 'sum',
-            'Gross Margin %': 'mean',
-            'Marketing Cost': 'sum',
-            'Voucher Cost': 'sum',
-            'Shipping Cost': 'sum'
-        }).reset_index()
-
-        margin_improvement['Total_Costs'] = margin_improvement['Marketing Cost'] + margin_improvement['Voucher Cost'] + margin_improvement['Shipping Cost']
-        margin_improvement['Cost_Revenue_Ratio'] = margin_improvement['Total_Costs'] / margin_improvement['Revenue']
-        margin_improvement['Improvement_Potential'] = margin_improvement['Revenue'] * (1 - margin_improvement['Gross Margin %']) * margin_improvement['Cost_Revenue_Ratio']
-        margin_improvement = margin_improvement.sort_values('Improvement_Potential', ascending=False)
+        margin_improvement = aggregates['margin_improvement']
 
         # Center the graph
-        fig = px.scatter(
-            margin_improvement.head(8),
-            x='Gross Margin %',
-            y='Revenue',
-            size='Improvement_Potential',
-            color='Cost_Revenue_Ratio',
-            hover_data=['Country', 'Category'],
-            title="Margin Improvement Opportunities (Size = Potential Impact)",
-            color_continuous_scale='Reds'
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figures['margin_priorities'], use_container_width=True)
 
         # Top 5 Priorities section under the graph
         st.markdown("### Top 5 Priorities for Margin Improvement")
@@ -1124,35 +1616,26 @@ def main():
         # Create columns for better layout of priorities
         priority_col1, priority_col2 = st.columns(2)
 
-        top_5_priorities = margin_improvement.head(5)
+        top_5_priorities = margin_improvement.head(5).to_dict('records')
+        # Scores are relative to the leading segment, which nlargest puts first
+        max_potential = margin_improvement['Improvement_Potential'].iloc[0]
+
+        priority_cards = [
+            PRIORITY_CARD_TEMPLATE.format_map({
+                **row,
+                'rank': "" if i < 3 else f"#{i + 1}",
+                'score': row['Improvement_Potential'] / max_potential * 100
+            })
+            for i, row in enumerate(top_5_priorities)
+        ]
 
         # First 3 priorities in left column
         with priority_col1:
-            for i, (_, row) in enumerate(top_5_priorities.head(3).iterrows()):
-                priority_score = row['Improvement_Potential'] / margin_improvement['Improvement_Potential'].max() * 100
-                rank_emoji = ["", "", ""][i]
-                st.markdown(f"""
-                <div style="background: #f8f9fa; padding: 1rem; margin: 0.5rem 0; border-radius: 8px; border-left: 4px solid #dc2626;">
-                    <h4>{rank_emoji} {row['Country']} - {row['Category']}</h4>
-                    <p><strong>Priority Score:</strong> {priority_score:.0f}/100</p>
-                    <p><strong>Current Margin:</strong> {row['Gross Margin %']:.1%}</p>
-                    <p><strong>Revenue:</strong> ${row['Revenue']:,.0f}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(''.join(priority_cards[:3]), unsafe_allow_html=True)
 
         # Last 2 priorities in right column
         with priority_col2:
-            for i, (_, row) in enumerate(top_5_priorities.tail(2).iterrows()):
-                priority_score = row['Improvement_Potential'] / margin_improvement['Improvement_Potential'].max() * 100
-                rank_number = i + 4
-                st.markdown(f"""
-                <div style="background: #f8f9fa; padding: 1rem; margin: 0.5rem 0; border-radius: 8px; border-left: 4px solid #dc2626;">
-                    <h4>#{rank_number} {row['Country']} - {row['Category']}</h4>
-                    <p><strong>Priority Score:</strong> {priority_score:.0f}/100</p>
-                    <p><strong>Current Margin:</strong> {row['Gross Margin %']:.1%}</p>
-                    <p><strong>Revenue:</strong> ${row['Revenue']:,.0f}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(''.join(priority_cards[3:]), unsafe_allow_html=True)
 
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1162,19 +1645,9 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        uae_data = df[df['Country'] == 'UAE']
-
-        # Calculate weighted average margin by revenue
-        total_uae_revenue = uae_data['Revenue'].sum()
-        weighted_margin = (uae_data['Revenue'] * uae_data['Gross Margin %']).sum() / total_uae_revenue
-
-        # By category breakdown
-        uae_category_margin = uae_data.groupby('Category').agg({
-            'Revenue': 'sum',
-            'Gross Margin %': 'mean'
-        }).reset_index()
-        uae_category_margin['Revenue_Weight'] = uae_category_margin['Revenue'] / total_uae_revenue
-        uae_category_margin['Weighted_Contribution'] = uae_category_margin['Revenue_Weight'] * uae_category_margin['Gross Margin %']
+        total_uae_revenue = aggregates['total_uae_revenue']
+        weighted_margin = aggregates['weighted_margin']
+        uae_category_margin = aggregates['uae_category_margin']
 
         col1, col2 = st.columns([1, 2])
 
@@ -1192,16 +1665,7 @@ def main():
 
         with col2:
             # Show contribution by category
-            fig = px.pie(
-                uae_category_margin,
-                values='Revenue',
-                names='Category',
-                title="UAE Revenue Distribution by Category",
-                hover_data=['Gross Margin %']
-            )
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            fig.update_layout(height=350)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figures['uae_revenue_mix'], use_container_width=True)
 
         # Calculation methodology
         st.markdown("### Calculation Methodology")
@@ -1214,9 +1678,10 @@ def main():
             <ul style="margin: 0.5rem 0;">
         """, unsafe_allow_html=True)
 
-        for _, row in uae_category_margin.iterrows():
-            weighted_contrib = (row['Revenue'] * row['Gross Margin %']) / total_uae_revenue
-            st.markdown(f"<li>{row['Category']}: ${row['Revenue']:,.0f} × {row['Gross Margin %']:.3%} = {weighted_contrib:.4%}</li>", unsafe_allow_html=True)
+        st.markdown(''.join(
+            f"<li>{row['Category']}: ${row['Revenue']:,.0f} × {row['Gross Margin %']:.3%} = {(row['Revenue'] * row['Gross Margin %']) / total_uae_revenue:.4%}</li>"
+            for row in uae_category_margin.to_dict('records')
+        ), unsafe_allow_html=True)
 
         st.markdown(f"""
             </ul>
@@ -1226,11 +1691,13 @@ def main():
 
         # Detailed breakdown table
         st.markdown("### Category Contribution Analysis")
-        uae_category_margin_display = uae_category_margin.copy()
-        uae_category_margin_display['Revenue'] = uae_category_margin_display['Revenue'].apply(lambda x: f"${x:,.0f}")
-        uae_category_margin_display['Gross Margin %'] = uae_category_margin_display['Gross Margin %'].apply(lambda x: f"{x:.1%}")
-        uae_category_margin_display['Revenue_Weight'] = uae_category_margin_display['Revenue_Weight'].apply(lambda x: f"{x:.1%}")
-        uae_category_margin_display['Weighted_Contribution'] = uae_category_margin_display['Weighted_Contribution'].apply(lambda x: f"{x:.3%}")
+        # Styler formats only for display, so the table stays numeric and is not copied
+        uae_category_margin_display = uae_category_margin.style.format({
+            'Revenue': '${:,.0f}',
+            'Gross Margin %': '{:.1%}',
+            'Revenue_Weight': '{:.1%}',
+            'Weighted_Contribution': '{:.3%}'
+        })
 
         st.dataframe(uae_category_margin_display, use_container_width=True, hide_index=True)
 
@@ -1242,84 +1709,40 @@ def main():
     with st.container():
         st.markdown('<div class="answer-content">', unsafe_allow_html=True)
 
-        # Analyze categories by repurchase rate and margin
-        repurchase_margin_analysis = df.groupby('Category').agg({
-            'Repurchase Rate': 'mean',
-            'Gross Margin %': 'mean',
-            'Revenue': 'sum',
-            'Orders': 'sum'
-        }).reset_index()
-
-        repurchase_margin_analysis['Revenue_Share'] = repurchase_margin_analysis['Revenue'] / repurchase_margin_analysis['Revenue'].sum()
-
         st.markdown("### Q12: Categories to Grow for Maximum Repurchase Rate")
 
         col1, col2 = st.columns(2)
 
         with col1:
             # Repurchase rate by category
-            fig = px.bar(
-                repurchase_margin_analysis.sort_values('Repurchase Rate', ascending=True),
-                x='Repurchase Rate',
-                y='Category',
-                orientation='h',
-                title="Repurchase Rate by Category",
-                color='Repurchase Rate',
-                color_continuous_scale='Greens'
-            )
-            fig.update_layout(height=350)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(figures['repurchase_by_category'], use_container_width=True)
 
         with col2:
             # Portfolio optimization matrix
-            fig2 = px.scatter(
-                repurchase_margin_analysis,
-                x='Repurchase Rate',
-                y='Gross Margin %',
-                size='Revenue',
-                color='Category',
-                title="Repurchase Rate vs Margin (Size = Revenue)",
-                labels={'Repurchase Rate': 'Repurchase Rate', 'Gross Margin %': 'Gross Margin %'}
-            )
-            fig2.update_layout(height=350)
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(figures['repurchase_vs_margin'], use_container_width=True)
 
         # Recommendations for category mix optimization
-        top_repurchase_categories = repurchase_margin_analysis.nlargest(3, 'Repurchase Rate')
+        top_repurchase_categories = aggregates['top_repurchase_categories']
+        top_repurchase_names = ', '.join(top_repurchase_categories['Category'])
 
         st.markdown("### Recommended Growth Strategy")
-        st.markdown("""
+        # The list items sit inside the card, so the card, list and items go out as one markdown element
+        top_repurchase_items = ''.join(
+            f"<li><strong>{cat['Category']}</strong>: {cat['Repurchase Rate']:.1%} repurchase rate, {cat['Gross Margin %']:.1%} margin</li>"
+            for cat in top_repurchase_categories.to_dict('records')
+        )
+        st.markdown(f"""
         <div class="insight-card">
             <h4>High-Repurchase Categories to Prioritize:</h4>
-            <ul>
+            <ul>{top_repurchase_items}</ul>
+        </div>
         """, unsafe_allow_html=True)
 
-        for _, cat in top_repurchase_categories.iterrows():
-            st.markdown(f"<li><strong>{cat['Category']}</strong>: {cat['Repurchase Rate']:.1%} repurchase rate, {cat['Gross Margin %']:.1%} margin</li>", unsafe_allow_html=True)
-
-        st.markdown("</ul></div>", unsafe_allow_html=True)
-
         # Q13: New weighted margin calculation
         st.markdown("### Q13: Optimized Category Mix Impact")
 
-        # Simulate increasing share of high-repurchase categories
-        optimized_mix = repurchase_margin_analysis.copy()
-
-        # Increase share of top 3 repurchase categories by 20% each, decrease others proportionally
-        high_repurchase_mask = optimized_mix['Category'].isin(top_repurchase_categories['Category'])
-
-        # Current weighted margin
-        current_weighted_margin = (optimized_mix['Revenue_Share'] * optimized_mix['Gross Margin %']).sum()
-
-        # Simulate optimized mix
-        optimized_mix.loc[high_repurchase_mask, 'Revenue_Share'] *= 1.2
-        optimized_mix.loc[~high_repurchase_mask, 'Revenue_Share'] *= 0.85
-
-        # Normalize to ensure shares sum to 1
-        optimized_mix['Revenue_Share'] = optimized_mix['Revenue_Share'] / optimized_mix['Revenue_Share'].sum()
-
-        # New weighted margin
-        new_weighted_margin = (optimized_mix['Revenue_Share'] * optimized_mix['Gross Margin %']).sum()
+        current_weighted_margin = aggregates['current_weighted_margin']
+        new_weighted_margin = aggregates['new_weighted_margin']
         margin_improvement = new_weighted_margin - current_weighted_margin
 
         # Calculation methodology
@@ -1330,7 +1753,7 @@ def main():
             <p><strong>Current Weighted Margin = </strong>Σ(Category_Revenue_Share × Category_Margin) = {current_weighted_margin:.4%}</p>
             <p><strong>Optimization Strategy:</strong></p>
             <ul>
-                <li>Increase high-repurchase categories by 20%: {', '.join(top_repurchase_categories['Category'].tolist())}</li>
+                <li>Increase high-repurchase categories by 20%: {top_repurchase_names}</li>
                 <li>Decrease other categories by 15% proportionally</li>
                 <li>Normalize shares to sum = 1.0</li>
             </ul>
@@ -1348,24 +1771,7 @@ def main():
             st.markdown(create_notion_card("Optimized Weighted Margin", f"{new_weighted_margin:.1%}", f"Improvement: +{margin_improvement:.1%}", "#059669"), unsafe_allow_html=True)
 
         # Show the optimization strategy
-        comparison_df = pd.DataFrame({
-            'Category': optimized_mix['Category'],
-            'Current Share': repurchase_margin_analysis['Revenue_Share'],
-            'Optimized Share': optimized_mix['Revenue_Share'],
-            'Gross Margin %': optimized_mix['Gross Margin %'],
-            'Repurchase Rate': optimized_mix['Repurchase Rate']
-        })
-        comparison_df['Share Change'] = comparison_df['Optimized Share'] - comparison_df['Current Share']
-
-        fig = px.bar(
-            comparison_df,
-            x='Category',
-            y=['Current Share', 'Optimized Share'],
-            title="Current vs Optimized Category Mix",
-            barmode='group'
-        )
-        fig.update_layout(height=350, xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(figures['category_mix'], use_container_width=True)
 
         # Strategy recommendations
         target_margin = current_weighted_margin + 0.05  # 5 percentage points higher
@@ -1375,7 +1781,7 @@ def main():
             <h3>Strategic Recommendations</h3>
             <p><strong>To achieve {target_margin:.1%} target margin (+5pp):</strong></p>
             <ol>
-                <li><strong>Category Mix:</strong> Increase share of high-repurchase categories ({', '.join(top_repurchase_categories['Category'].tolist())})</li>
+                <li><strong>Category Mix:</strong> Increase share of high-repurchase categories ({top_repurchase_names})</li>
                 <li><strong>AOV Strategy:</strong> Focus on upselling in high-margin categories</li>
                 <li><strong>Cost Optimization:</strong> Reduce marketing spend in low-efficiency categories</li>
                 <li><strong>Customer Retention:</strong> Leverage strong repurchase behavior for sustainable growth</li>
@@ -1416,45 +1822,21 @@ def main():
         <div class="insight-card">
             <h3>Business Performance Summary</h3>
             <ul>
-                <li><strong>Total Business Value:</strong> ${df['Revenue'].sum():,.0f} across all segments</li>
-                <li><strong>Order Volume:</strong> {df['Orders'].sum():,.0f} total orders processed</li>
-                <li><strong>Customer Base:</strong> {df['Total_Customers'].sum():,.0f} total customers served</li>
-                <li><strong>Average Margin:</strong> {df['Gross Margin %'].mean():.1%} weighted across portfolio</li>
-                <li><strong>Repurchase Performance:</strong> {df['Repurchase Rate'].mean():.1%} average retention rate</li>
+                <li><strong>Total Business Value:</strong> ${kpis['total_revenue']:,.0f} across all segments</li>
+                <li><strong>Order Volume:</strong> {kpis['total_orders']:,.0f} total orders processed</li>
+                <li><strong>Customer Base:</strong> {kpis['total_customers']:,.0f} total customers served</li>
+                <li><strong>Average Margin:</strong> {kpis['avg_margin']:.1%} weighted across portfolio</li>
+                <li><strong>Repurchase Performance:</strong> {kpis['avg_repurchase']:.1%} average retention rate</li>
             </ul>
         </div>
         """, unsafe_allow_html=True)
 
     # Strategic insights from the analysis
-    st.markdown("""
-    <div class="insight-card">
-        <h3>Key Strategic Findings</h3>
-        <p>This comprehensive analysis of Mumzworld's business performance reveals significant opportunities for optimization across multiple dimensions:</p>
-        <ul>
-            <li><strong>Market Leadership:</strong> KSA Diapers demonstrates the highest margins at 46.4%, establishing a benchmark for profitability optimization</li>
-            <li><strong>Cost Efficiency Gaps:</strong> Voucher spending varies dramatically from 2.1% to 4.2% of revenue, indicating immediate savings opportunities</li>
-            <li><strong>Operational Excellence:</strong> Delivery performance correlates with success rates, highlighting logistics as a competitive differentiator</li>
-            <li><strong>Customer Value:</strong> Repurchase behavior varies significantly by category, suggesting targeted retention strategies can drive sustainable growth</li>
-            <li><strong>Margin Expansion:</strong> Combined optimization initiatives across shipping, vouchers, and category mix could deliver $1.2M+ annual profit improvement</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(STRATEGIC_FINDINGS_HTML, unsafe_allow_html=True)
 
     # Top 3 immediate priorities
     st.markdown("### TOP 3 IMMEDIATE PRIORITIES")
-    st.markdown("""
-    <div class="insight-card">
-        <h4>Critical Actions for Mumzworld Leadership:</h4>
-        <ol style="font-size: 1.1rem; line-height: 1.6;">
-            <li><strong style="color: #dc2626;">Launch KSA Gear margin improvement project</strong> - $1.16M potential value creation</li>
-            <li><strong style="color: #dc2626;">Cut UAE Diapers voucher spend by 30%</strong> - improve profitability immediately</li>
-            <li><strong style="color: #dc2626;">Double marketing investment in Gear category</strong> - highest efficiency for sustainable growth</li>
-        </ol>
-        <div style="background: #fef3c7; padding: 1rem; border-radius: 6px; margin-top: 1rem;">
-            <strong>Expected Impact:</strong> Combined initiatives could deliver $1.2M+ annual profit improvement
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(IMMEDIATE_PRIORITIES_HTML, unsafe_allow_html=True)
 
     # Footer
     st.markdown("---")
@@ -1468,4 +1850,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,7 +3,11 @@ import numpy as np
 
 def analyze_business_questions():
     # Load and analyze the dataset
-    df = pd.read_excel('attached_assets/Planning_Performance_Dataset_1753898833288.xlsx')
+    df = pd.read_excel(
+        'attached_assets/Planning_Performance_Dataset_1753898833288.xlsx',
+        engine='openpyxl',
+        engine_kwargs={'read_only': True, 'data_only': True}
+    )
     
     # Add derived metrics
     df['Month_Date'] = pd.to_datetime(df['Month'], format='%b-%Y')
@@ -3,12 +3,70 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import plotly.figure_factory as ff
+
+def lttb_indices(x, y, n_out):
+    """Pick n_out row positions with Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bucket_size = (n - 2) / (n_out - 2)
+    
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        
+        # Average of the next bucket is the third triangle vertex
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    
+    return indices
 
 class ChartGenerator:
+    # Above this many points scatter/line traces switch to WebGL
+    WEBGL_THRESHOLD = 1000
+    # Cap on points shipped to the browser for scatter/line charts
+    MAX_PLOT_POINTS = 10000
+    
     def __init__(self, data):
         self.data = data
         
+    def _use_webgl(self, render_mode, n_points):
+        """Resolve a Plotly render_mode hint for raw graph_objects traces"""
+        if render_mode == 'auto':
+            return n_points > self.WEBGL_THRESHOLD
+        return render_mode == 'webgl'
+        
+    def _histogram_trace(self, column, bins, name):
+        """Bin a numeric column server-side so only the bin counts reach the browser"""
+        values = self.data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        # np.histogram cannot place ±inf (e.g. a ratio over a zero denominator) in a finite range
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return go.Bar(x=[], y=[], name=name)
+        counts, edges = np.histogram(values, bins=bins)
+        return go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            name=name
+        )
+        
     def create_distribution_chart(self, column):
         """Create distribution chart for a numeric column"""
         if not pd.api.types.is_numeric_dtype(self.data[column]):
@@ -31,7 +89,7 @@ class ChartGenerator:
             
             # Histogram
             fig.add_trace(
-                go.Histogram(x=self.data[column], name='Distribution', nbinsx=30),
+                self._histogram_trace(column, bins=30, name='Distribution'),
                 row=1, col=1
             )
             
@@ -82,7 +140,7 @@ class ChartGenerator:
         
         return fig
     
-    def create_time_series_chart(self, date_column, value_column):
+    def create_time_series_chart(self, date_column, value_column, render_mode='auto'):
         """Create time series chart"""
         try:
             # Try to convert to datetime
@@ -97,21 +155,33 @@ class ChartGenerator:
             plot_data[date_column] = date_data[valid_dates]
             plot_data = plot_data.sort_values(date_column)
             
+            # Trend is fitted on the full series before downsampling
+            x_numeric = np.arange(len(plot_data))
+            coeffs = np.polyfit(x_numeric, plot_data[value_column], 1)
+            trend_line = coeffs[0] * x_numeric + coeffs[1]
+            
+            if len(plot_data) > self.MAX_PLOT_POINTS:
+                keep = lttb_indices(
+                    plot_data[date_column].to_numpy(dtype='datetime64[ns]').astype(np.int64),
+                    plot_data[value_column].to_numpy(),
+                    self.MAX_PLOT_POINTS
+                )
+                plot_data = plot_data.iloc[keep]
+                trend_line = trend_line[keep]
+            
             fig = px.line(
                 plot_data,
                 x=date_column,
                 y=value_column,
                 title=f"{value_column} Over Time",
-                markers=True
+                markers=True,
+                render_mode=render_mode
             )
             
             # Add trend line
-            x_numeric = np.arange(len(plot_data))
-            coeffs = np.polyfit(x_numeric, plot_data[value_column], 1)
-            trend_line = coeffs[0] * x_numeric + coeffs[1]
-            
+            trace_type = go.Scattergl if self._use_webgl(render_mode, len(plot_data)) else go.Scatter
             fig.add_trace(
-                go.Scatter(
+                trace_type(
                     x=plot_data[date_column],
                     y=trend_line,
                     mode='lines',
@@ -163,17 +233,65 @@ class ChartGenerator:
         
         return fig
     
-    def create_scatter_chart(self, x_column, y_column, color_column=None):
+    def _add_linear_trend(self, fig, x_column, y_column, render_mode, n_points, color_column=None):
+        """Overlay least-squares lines fitted on the full data with numpy, one per colour group"""
+        trace_type = go.Scattergl if self._use_webgl(render_mode, n_points) else go.Scatter
+        
+        # A continuous colour column gets a colour scale, not one trace per value, so it shares a single fit
+        if color_column is not None and not pd.api.types.is_numeric_dtype(self.data[color_column]):
+            valid = self.data[[x_column, y_column, color_column]].dropna()
+            groups = [(str(name), part) for name, part in valid.groupby(color_column, observed=True)]
+            trace_colors = {trace.name: trace.marker.color for trace in fig.data}
+        else:
+            groups = [(None, self.data[[x_column, y_column]].dropna())]
+            trace_colors = {}
+        
+        for name, part in groups:
+            if len(part) < 2:
+                continue
+            x = part[x_column].to_numpy(dtype=float)
+            y = part[y_column].to_numpy(dtype=float)
+            slope, intercept = np.polyfit(x, y, 1)
+            r_squared = np.corrcoef(x, y)[0, 1] ** 2
+            ends = np.array([x.min(), x.max()])
+            
+            hover_group = "" if name is None else f"{color_column}={name}<br>"
+            fig.add_trace(
+                trace_type(
+                    x=ends,
+                    y=slope * ends + intercept,
+                    mode='lines',
+                    name='Trend' if name is None else name,
+                    legendgroup=name,
+                    showlegend=name is None,
+                    hovertemplate=(
+                        f"<b>OLS trendline</b><br>{y_column} = {slope:g} * {x_column} + {intercept:g}<br>"
+                        f"R<sup>2</sup>={r_squared:f}<br><br>{hover_group}"
+                        f"{x_column}=%{{x}}<br>{y_column}=%{{y}} <b>(trend)</b><extra></extra>"
+                    ),
+                    line=dict(dash='dash', color='red') if name is None else dict(color=trace_colors.get(name))
+                )
+            )
+    
+    def create_scatter_chart(self, x_column, y_column, color_column=None, render_mode='auto'):
         """Create scatter plot"""
+        plot_data = self.data
+        if len(plot_data) > self.MAX_PLOT_POINTS:
+            # Unordered points have no series shape to preserve, so sample uniformly
+            plot_data = plot_data.sample(n=self.MAX_PLOT_POINTS, random_state=42)
+        
         fig = px.scatter(
-            self.data,
+            plot_data,
             x=x_column,
             y=y_column,
             color=color_column,
             title=f"{y_column} vs {x_column}",
-            trendline="ols" if pd.api.types.is_numeric_dtype(self.data[x_column]) and pd.api.types.is_numeric_dtype(self.data[y_column]) else None
+            render_mode=render_mode
         )
         
+        if pd.api.types.is_numeric_dtype(self.data[x_column]) and pd.api.types.is_numeric_dtype(self.data[y_column]):
+            self._add_linear_trend(fig, x_column, y_column, render_mode, len(plot_data), color_column)
+        
         fig.update_layout(
             height=400,
             font=dict(size=12),
@@ -182,10 +300,10 @@ class ChartGenerator:
         
         return fig
     
-    def create_custom_chart(self, x_column, y_column, chart_type='scatter'):
+    def create_custom_chart(self, x_column, y_column, chart_type='scatter', render_mode='auto'):
         """Create custom chart based on user selection"""
         if chart_type == 'scatter':
-            return self.create_scatter_chart(x_column, y_column)
+            return self.create_scatter_chart(x_column, y_column, render_mode=render_mode)
         
         elif chart_type == 'line':
             fig = px.line(
@@ -193,7 +311,8 @@ class ChartGenerator:
                 x=x_column,
                 y=y_column,
                 title=f"{y_column} vs {x_column}",
-                markers=True
+                markers=True,
+                render_mode=render_mode
             )
         
         elif chart_type == 'bar':
@@ -219,7 +338,7 @@ class ChartGenerator:
         
         else:
             # Default to scatter
-            return self.create_scatter_chart(x_column, y_column)
+            return self.create_scatter_chart(x_column, y_column, render_mode=render_mode)
         
         fig.update_layout(
             height=400,
@@ -252,7 +371,7 @@ class ChartGenerator:
             col_pos = (i % 2) + 1
             
             fig.add_trace(
-                go.Histogram(x=self.data[col], name=col, nbinsx=20),
+                self._histogram_trace(col, bins=20, name=col),
                 row=row, col=col_pos
             )
         
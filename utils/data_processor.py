@@ -1,25 +1,34 @@
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
 class DataProcessor:
     def __init__(self, data):
         self.data = data
+        self._outlier_cache = {}
+        self._duplicate_count = None
+        
+        # Column-type index, computed once and shared by every analysis pass
+        self.numeric_columns = data.select_dtypes(include=[np.number]).columns
+        self.categorical_columns = data.select_dtypes(include=['object', 'category']).columns
         
     def get_column_info(self):
         """Get comprehensive column information"""
+        # Frame-wide counts in one pass each instead of per-column rescans
+        null_counts = self.data.isnull().sum()
+        unique_counts = self.data.nunique()
+        n_rows = len(self.data)
+        
         info = []
         for col in self.data.columns:
             col_data = self.data[col]
+            null_count = null_counts[col]
             info.append({
                 'Column': col,
                 'Type': str(col_data.dtype),
-                'Non-Null Count': col_data.count(),
-                'Null Count': col_data.isnull().sum(),
-                'Null %': f"{(col_data.isnull().sum() / len(col_data) * 100):.1f}%",
-                'Unique Values': col_data.nunique(),
+                'Non-Null Count': n_rows - null_count,
+                'Null Count': null_count,
+                'Null %': f"{(null_count / n_rows * 100):.1f}%",
+                'Unique Values': unique_counts[col],
                 'Sample Values': ', '.join(str(x) for x in col_data.dropna().unique()[:3])
             })
         return pd.DataFrame(info)
@@ -34,7 +43,10 @@ class DataProcessor:
         
         if len(missing_percent) == 0:
             return None
-            
+        
+        # Deferred so that InsightGenerator, which never plots, does not load plotly
+        import plotly.express as px
+        
         fig = px.bar(
             x=missing_percent.index,
             y=missing_percent.values,
@@ -54,6 +66,13 @@ class DataProcessor:
         """Detect outliers in a numeric column"""
         if not pd.api.types.is_numeric_dtype(self.data[column]):
             return []
+        
+        # Reuse results already computed for this column (insights and the
+        # data quality summary both scan every numeric column)
+        cache_key = (column, method)
+        # Hand out copies so a caller mutating its list cannot change later results
+        if cache_key in self._outlier_cache:
+            return list(self._outlier_cache[cache_key])
             
         col_data = self.data[column].dropna()
         
@@ -67,15 +86,22 @@ class DataProcessor:
         else:  # z-score method
             z_scores = np.abs((col_data - col_data.mean()) / col_data.std())
             outliers = col_data[z_scores > 3]
-            
-        return outliers.index.tolist()
+        
+        self._outlier_cache[cache_key] = tuple(outliers.index)
+        return list(self._outlier_cache[cache_key])
     
     def get_correlation_matrix(self):
         """Calculate correlation matrix for numeric columns"""
-        numeric_cols = self.data.select_dtypes(include=[np.number])
-        if len(numeric_cols.columns) < 2:
+        if len(self.numeric_columns) < 2:
             return None
-        return numeric_cols.corr()
+        return self.data[self.numeric_columns].corr()
+    
+    def count_duplicates(self):
+        """Count duplicate rows by hashing each row to a single int64"""
+        if self._duplicate_count is None:
+            row_hashes = pd.util.hash_pandas_object(self.data, index=False)
+            self._duplicate_count = int(row_hashes.duplicated().sum())
+        return self._duplicate_count
     
     def get_data_quality_summary(self):
         """Get comprehensive data quality summary"""
@@ -83,7 +109,7 @@ class DataProcessor:
         missing_cells = self.data.isnull().sum().sum()
         completeness = ((total_cells - missing_cells) / total_cells) * 100
         
-        duplicates = self.data.duplicated().sum()
+        duplicates = self.count_duplicates()
         
         recommendations = []
         if completeness < 95:
@@ -91,7 +117,7 @@ class DataProcessor:
         if duplicates > 0:
             recommendations.append(f"Remove {duplicates} duplicate rows")
             
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.numeric_columns
         for col in numeric_cols:
             outliers = self.detect_outliers(col)
             if len(outliers) > len(self.data) * 0.05:  # More than 5% outliers
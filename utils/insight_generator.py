@@ -1,8 +1,3 @@
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
 from utils.data_processor import DataProcessor
 
 class InsightGenerator:
@@ -51,12 +46,12 @@ class InsightGenerator:
             findings.append("Complete dataset: No missing values detected")
         
         # Data types insight
-        numeric_cols = len(self.data.select_dtypes(include=[np.number]).columns)
-        categorical_cols = len(self.data.select_dtypes(include=['object', 'category']).columns)
+        numeric_cols = len(self.processor.numeric_columns)
+        categorical_cols = len(self.processor.categorical_columns)
         findings.append(f"Data types: {numeric_cols} numeric, {categorical_cols} categorical columns")
         
         # Duplicates insight
-        duplicates = self.data.duplicated().sum()
+        duplicates = self.processor.count_duplicates()
         if duplicates > 0:
             findings.append(f"Found {duplicates} duplicate records ({duplicates/len(self.data)*100:.1f}%)")
         
@@ -97,7 +92,7 @@ class InsightGenerator:
     def detect_all_outliers(self):
         """Detect outliers in all numeric columns"""
         outliers = []
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.processor.numeric_columns
         
         for col in numeric_cols:
             outlier_indices = self.processor.detect_outliers(col)
@@ -113,7 +108,7 @@ class InsightGenerator:
     def analyze_all_trends(self):
         """Analyze trends in all numeric columns"""
         trends = []
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.processor.numeric_columns
         
         for col in numeric_cols:
             trend = self.processor.analyze_trends(col)
@@ -125,7 +120,7 @@ class InsightGenerator:
     def analyze_distributions(self):
         """Analyze distribution characteristics of numeric columns"""
         distributions = []
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.processor.numeric_columns
         
         for col in numeric_cols:
             col_data = self.data[col].dropna()
@@ -168,7 +163,7 @@ class InsightGenerator:
     def find_categorical_patterns(self):
         """Find patterns in categorical variables"""
         patterns = []
-        categorical_cols = self.data.select_dtypes(include=['object', 'category']).columns
+        categorical_cols = self.processor.categorical_columns
         
         for col in categorical_cols:
             value_counts = self.data[col].value_counts()
@@ -204,12 +199,12 @@ class InsightGenerator:
                 break
         
         # Check for clustering potential
-        numeric_cols = self.data.select_dtypes(include=[np.number]).columns
+        numeric_cols = self.processor.numeric_columns
         if len(numeric_cols) >= 2:
             suggestions.append("Dataset suitable for clustering analysis")
         
         # Check for classification potential
-        categorical_cols = self.data.select_dtypes(include=['object', 'category']).columns
+        categorical_cols = self.processor.categorical_columns
         if len(categorical_cols) > 0 and len(numeric_cols) > 0:
             suggestions.append("Consider classification modeling with categorical targets")
         